@@ -0,0 +1,76 @@
+import hashlib
+import logging
+import os
+import time
+from typing import Any
+
+from pydantic_core import from_json, to_json
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "604800"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+RESULT_CACHE_MAX_VALUE_BYTES = int(os.getenv("RESULT_CACHE_MAX_VALUE_BYTES", "262144"))
+
+
+def fingerprint(*parts: str | bytes) -> str:
+    """Stable hash of the parts, e.g. a prompt or a JSON schema."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Memoized results in Redis under one namespace.
+
+    Entries expire after RESULT_CACHE_TTL. An index sorted by last use keeps
+    at most RESULT_CACHE_MAX_ENTRIES entries per namespace and evicts the
+    least recently used; results larger than RESULT_CACHE_MAX_VALUE_BYTES
+    are not cached. Index members unused for longer than the TTL point at
+    expired entries and are pruned on every write, and the index itself
+    expires with the namespace's last write.
+    """
+
+    def __init__(self, connection: Any, namespace: str):
+        self.connection = connection
+        self.namespace = namespace
+        self._index = f"results:{namespace}:index"
+
+    def _key(self, key: str) -> str:
+        return f"results:{self.namespace}:{key}"
+
+    def get(self, key: str) -> Any | None:
+        pipe = self.connection.pipeline(transaction=False)
+        pipe.get(self._key(key))
+        pipe.zadd(self._index, {key: time.time()}, xx=True, ch=True)
+        raw, indexed = pipe.execute()
+        if raw is None:
+            if indexed:
+                # The entry expired but its index member outlived it
+                self.connection.zrem(self._index, key)
+            return None
+        return from_json(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        raw = to_json(value)
+        if len(raw) > RESULT_CACHE_MAX_VALUE_BYTES:
+            logger.info("Result for %s too large to cache: %s bytes", key, len(raw))
+            return
+
+        now = time.time()
+        pipe = self.connection.pipeline(transaction=False)
+        pipe.set(self._key(key), raw, ex=RESULT_CACHE_TTL)
+        pipe.zadd(self._index, {key: now})
+        pipe.zremrangebyscore(self._index, "-inf", now - RESULT_CACHE_TTL)
+        pipe.expire(self._index, RESULT_CACHE_TTL)
+        pipe.zcard(self._index)
+        *_, size = pipe.execute()
+
+        excess = size - RESULT_CACHE_MAX_ENTRIES
+        if excess > 0:
+            evicted = self.connection.zpopmin(self._index, excess)
+            self.connection.delete(
+                *(self._key(member.decode()) for member, _ in evicted)
+            )
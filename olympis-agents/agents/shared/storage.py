@@ -0,0 +1,249 @@
+"""Content-addressed blob storage for pipeline artifacts.
+
+Artifacts are stored zlib-compressed under the SHA-256 of their content and
+passed between pipeline stages as `sha256:<hex>` references, so the queue
+only ever carries the reference. Identical content is stored once.
+
+References only live as long as a pipeline run or a cache entry, so blobs
+not stored again within STORAGE_RETENTION_SECONDS are deleted by sweep().
+Running this module as a script sweeps once; the blob-sweeper CronJob in
+k8s/base/storage.yaml does so periodically.
+
+This module is copied, not shared, because each service builds its own
+image: olympis-server/app/db/storage.py, olympis-crawler/storage.py and
+olympis-agents/agents/shared/storage.py. Change all three together; they
+must stay byte-for-byte identical.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Protocol
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_LOCAL_PATH = os.getenv("STORAGE_LOCAL_PATH", "/tmp/olympis-blobs")
+STORAGE_BUCKET = os.getenv("STORAGE_BUCKET", "olympis-blobs")
+STORAGE_COMPRESSION_LEVEL = int(os.getenv("STORAGE_COMPRESSION_LEVEL", "6"))
+# Longer than any reference lives, i.e. a pipeline run or a cache entry
+STORAGE_RETENTION_SECONDS = int(os.getenv("STORAGE_RETENTION_SECONDS", "604800"))
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY")
+S3_SECRET_KEY = os.getenv("S3_SECRET_KEY")
+
+_REF_PREFIX = "sha256:"
+_BLOB_PREFIX = "blobs/"
+
+
+class BlobNotFoundError(KeyError):
+    pass
+
+
+class ObjectStore(Protocol):
+    """The subset of an S3-compatible object store the blob store needs."""
+
+    def put(self, key: str, body: bytes) -> None: ...
+
+    def get(self, key: str) -> bytes: ...
+
+    def exists(self, key: str) -> bool: ...
+
+    def touch(self, key: str) -> bool:
+        """Mark `key` as just stored; False if it does not exist."""
+        ...
+
+    def delete_older_than(self, prefix: str, cutoff: float) -> int:
+        """Delete objects under `prefix` last stored before `cutoff`."""
+        ...
+
+
+class LocalObjectStore:
+    """Objects as files under a root directory, written atomically."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def put(self, key: str, body: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise BlobNotFoundError(key) from None
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def touch(self, key: str) -> bool:
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def delete_older_than(self, prefix: str, cutoff: float) -> int:
+        # Also removes temporary files left behind by interrupted writes
+        deleted = 0
+        for path in self._path(prefix).rglob("*"):
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                pass
+        return deleted
+
+
+class S3ObjectStore:
+    """Objects in a bucket of an S3-compatible service.
+
+    `client` is a boto3 S3 client or anything with the same put_object,
+    get_object, head_object, copy_object, delete_objects and list_objects_v2
+    calls, e.g. one pointed at a local MinIO.
+    """
+
+    def __init__(self, client: Any, bucket: str):
+        self.client = client
+        self.bucket = bucket
+
+    def put(self, key: str, body: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=body)
+
+    def get(self, key: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if _is_missing(e):
+                raise BlobNotFoundError(key) from None
+            raise
+        return response["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if _is_missing(e):
+                return False
+            raise
+        return True
+
+    def touch(self, key: str) -> bool:
+        # Copying an object onto itself is how S3 updates LastModified
+        try:
+            self.client.copy_object(
+                Bucket=self.bucket,
+                Key=key,
+                CopySource={"Bucket": self.bucket, "Key": key},
+                MetadataDirective="REPLACE",
+            )
+        except Exception as e:
+            if _is_missing(e):
+                return False
+            raise
+        return True
+
+    def delete_older_than(self, prefix: str, cutoff: float) -> int:
+        deleted = 0
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            keys = [
+                {"Key": item["Key"]}
+                for item in page.get("Contents", [])
+                if item["LastModified"].timestamp() < cutoff
+            ]
+            if keys:
+                # A listing page holds at most 1000 keys, the delete_objects limit
+                self.client.delete_objects(
+                    Bucket=self.bucket, Delete={"Objects": keys, "Quiet": True}
+                )
+                deleted += len(keys)
+        return deleted
+
+
+def _is_missing(error: Exception) -> bool:
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+class BlobStore:
+    def __init__(self, objects: ObjectStore):
+        self.objects = objects
+
+    @staticmethod
+    def _key(digest: str) -> str:
+        return f"{_BLOB_PREFIX}sha256/{digest[:2]}/{digest}.z"
+
+    @staticmethod
+    def _digest(ref: str) -> str:
+        if not ref.startswith(_REF_PREFIX):
+            raise ValueError(f"Not a blob reference: {ref!r}")
+        return ref[len(_REF_PREFIX) :]
+
+    def put(self, data: bytes) -> str:
+        """Store `data` and return its reference.
+
+        Existing content is not rewritten, only touched so sweep() keeps it
+        as long as a new reference to it may exist.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        key = self._key(digest)
+        if not self.objects.touch(key):
+            self.objects.put(key, zlib.compress(data, STORAGE_COMPRESSION_LEVEL))
+        return _REF_PREFIX + digest
+
+    def get(self, ref: str) -> bytes:
+        return zlib.decompress(self.objects.get(self._key(self._digest(ref))))
+
+    def exists(self, ref: str) -> bool:
+        return self.objects.exists(self._key(self._digest(ref)))
+
+    def put_text(self, text: str) -> str:
+        return self.put(text.encode("utf-8"))
+
+    def get_text(self, ref: str) -> str:
+        return self.get(ref).decode("utf-8")
+
+    def sweep(self, max_age: float = STORAGE_RETENTION_SECONDS) -> int:
+        """Delete blobs last stored more than `max_age` seconds ago."""
+        return self.objects.delete_older_than(_BLOB_PREFIX, time.time() - max_age)
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(_REF_PREFIX)
+
+
+def init_storage() -> BlobStore:
+    if STORAGE_BACKEND == "s3":
+        # boto3 is only needed, and only installed, where the S3 backend is used
+        import boto3
+
+        client = boto3.client(
+            "s3",
+            endpoint_url=S3_ENDPOINT_URL,
+            aws_access_key_id=S3_ACCESS_KEY,
+            aws_secret_access_key=S3_SECRET_KEY,
+        )
+        return BlobStore(S3ObjectStore(client, STORAGE_BUCKET))
+    if STORAGE_BACKEND == "local":
+        return BlobStore(LocalObjectStore(STORAGE_LOCAL_PATH))
+    raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND!r}")
+
+
+if __name__ == "__main__":
+    deleted = init_storage().sweep()
+    print(f"Deleted {deleted} blobs older than {STORAGE_RETENTION_SECONDS}s")
@@ -1,20 +1,14 @@
-import json
-
 from rq import get_current_job
 
+from agents.shared.envelope import publish_event
+
 
-def update_job_progress(message: str, events_id: str | None):
+def update_job_progress(message: str, events_id: str | None, stage: str = "extract"):
     job = get_current_job()
     if job is None:
         raise
 
-    r = job.connection
     if events_id is None:
         events_id = job.id
 
-    progress = {"progress": message}
-
-    r.xadd(
-        f"job:{events_id}:events",
-        {"data": json.dumps(progress, default=str)},
-    )
+    publish_event(job.connection, events_id, "progress", stage, {"message": message})
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 import math
 import time
@@ -5,10 +7,27 @@ import traceback
 
 from rq import get_current_job
 
+from agents.shared.result_cache import ResultCache, fingerprint
+from agents.shared.storage import init_storage, is_blob_ref
 from agents.shared.utils import update_job_progress
+from agents.store_extractor.prompt import instructions
+from agents.store_extractor.schema import StoreMetaData
 
 logger = logging.getLogger(__name__)
 
+# Any change to the prompt or the output schema changes every cache key, so
+# results of an older extractor are never served
+EXTRACTOR_VERSION = fingerprint(
+    instructions, json.dumps(StoreMetaData.model_json_schema(), sort_keys=True)
+)
+
+
+def _content_hash(html: str) -> str:
+    # A blob reference already is the SHA-256 of its content
+    if is_blob_ref(html):
+        return html.partition(":")[2]
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
 
 def extract_store_data(html: str | None = None, events_id: str | None = None):
     try:
@@ -21,6 +40,16 @@ def extract_store_data(html: str | None = None, events_id: str | None = None):
             dependencies = job.fetch_dependencies()
             html = dependencies[0].result
 
+        cache = ResultCache(job.connection, "store_extractor")
+        cache_key = f"{EXTRACTOR_VERSION}:{_content_hash(html)}"
+        result = cache.get(cache_key)
+        if result is not None:
+            logger.info("Extraction cache hit for %s", cache_key)
+            return result
+
+        if is_blob_ref(html):
+            html = init_storage().get_text(html)
+
         result = {"agent": 1}
 
         # this simulates heavy llm parsing/text processing for 4 seconds
@@ -29,6 +58,7 @@ def extract_store_data(html: str | None = None, events_id: str | None = None):
              math.factorial(100) # Math intensive
              time.sleep(0.1)
 
+        cache.set(cache_key, result)
         return result
     except Exception:
         logger.error("extract_store_data failed:\n%s", traceback.format_exc())
@@ -0,0 +1,189 @@
+"""Compare the single-pass cleaner with the previous inscriptis-based one.
+
+Usage, from olympis-crawler:
+
+    python benchmarks/clean_html.py --fetch URL [URL ...]
+    python benchmarks/clean_html.py [CORPUS_DIR] [--repeat N] [--diff OUT_DIR]
+
+--fetch saves storefront pages (collections, product pages) to CORPUS_DIR,
+benchmarks/corpus by default; the pages are third-party content and stay
+out of git. Pages saved otherwise, e.g. with "Save page as" or `curl -o`,
+work as well.
+
+For every page the two cleaners are timed and their text compared: "words"
+is the share of words both produce in the same order, "lines" the line
+counts of each. --diff writes both texts per page to OUT_DIR for review.
+Without a corpus, synthetic product-grid pages are used, which only
+measure speed.
+"""
+
+import argparse
+import difflib
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from inscriptis import get_text
+from lxml import html as LH
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cleaner import html_to_text  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "corpus"
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
+)
+
+
+def clean_html_previous(html: str, base_url: str | None = None) -> str:
+    """clean_html before the single-pass cleaner, kept as the baseline."""
+    doc = LH.fromstring(html, base_url=base_url)
+    base = doc.base_url
+
+    for img in doc.xpath("//img"):
+        src = img.get("src") or ""
+        if src == "":
+            continue
+        if base:
+            src = urljoin(base, src)
+        alt = (img.get("alt") or "").strip().replace('"', '\\"')
+        marker = f'[IMAGE alt="{alt}" src="{src}"]'
+        parent = img.getparent()
+        i = parent.index(img)
+        parent.remove(img)
+        parent.insert(i, LH.fromstring(f"<span>{marker}</span>"))
+
+    return get_text(LH.tostring(doc, encoding="unicode"))
+
+
+def clean_html_single_pass(html: str, base_url: str | None = None) -> str:
+    doc = LH.fromstring(html, base_url=base_url)
+    return html_to_text(doc, doc.base_url)
+
+
+def synthetic_page(products: int) -> str:
+    cards = "".join(
+        f"""
+        <li class="grid__item">
+          <div class="card">
+            <a href="/products/item-{i}">
+              <img src="//cdn.shop.example/files/item-{i}.jpg?width=533"
+                   alt="Product {i} front" loading="lazy" width="533" height="533">
+              <img src="//cdn.shop.example/files/item-{i}-back.jpg?width=533"
+                   alt="Product {i} back" loading="lazy" width="533" height="533">
+            </a>
+            <h3 class="card__heading"><a href="/products/item-{i}">Product {i}</a></h3>
+            <div class="price"><span class="price-item">${i % 90 + 10}.00</span></div>
+            <svg viewBox="0 0 10 10"><path d="M0 0h10v10H0z"/></svg>
+          </div>
+        </li>"""
+        for i in range(products)
+    )
+    scripts = "<script>window.Shopify = {};</script>" * 20
+    return f"""<!doctype html><html><head><title>Collection</title>
+    <style>.card {{ display: block }}</style>{scripts}</head>
+    <body><header><nav><ul><li><a href="/">Home</a></li></ul></nav></header>
+    <main id="MainContent"><h1>All products</h1><ul class="grid">{cards}</ul></main>
+    <footer><p>&copy; Example shop</p></footer></body></html>"""
+
+
+def fetch_corpus(urls: list[str], directory: Path) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for url in urls:
+        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=30)
+        response.raise_for_status()
+        parts = urlsplit(url)
+        name = re.sub(r"[^\w.-]+", "_", f"{parts.hostname}{parts.path}").strip("_")
+        path = directory / f"{name}.html"
+        path.write_text(response.text, encoding="utf-8")
+        print(f"Saved {url} to {path}")
+
+
+def load_corpus(directory: Path | None) -> list[tuple[str, str]]:
+    if directory is None:
+        if not any(DEFAULT_CORPUS.glob("*.html")):
+            print("No corpus, timing synthetic pages only")
+            return [
+                (f"synthetic-{n}", synthetic_page(n)) for n in (50, 200, 800)
+            ]
+        directory = DEFAULT_CORPUS
+    pages = sorted(directory.glob("*.html"))
+    if not pages:
+        raise SystemExit(f"No *.html pages in {directory}")
+    return [
+        (path.name, path.read_text(encoding="utf-8", errors="replace"))
+        for path in pages
+    ]
+
+
+def timed(clean, html: str, repeat: int) -> tuple[float, str]:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = clean(html, "https://shop.example/collections/all")
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs) * 1000, text
+
+
+def word_match(previous: str, single: str) -> float:
+    matcher = difflib.SequenceMatcher(
+        None, previous.split(), single.split(), autojunk=False
+    )
+    return matcher.ratio()
+
+
+def line_count(text: str) -> int:
+    return sum(1 for line in text.splitlines() if line.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fetch", nargs="+", metavar="URL")
+    parser.add_argument("--diff", type=Path, metavar="OUT_DIR")
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_corpus(args.fetch, args.corpus or DEFAULT_CORPUS)
+        return
+
+    corpus = load_corpus(args.corpus)
+    if args.diff:
+        args.diff.mkdir(parents=True, exist_ok=True)
+    print(
+        f"{'page':<32} {'KiB':>7} {'imgs':>5} {'previous ms':>12} "
+        f"{'single ms':>10} {'speedup':>8} {'words':>7} {'lines':>13}"
+    )
+    totals = [0.0, 0.0]
+    for name, html in corpus:
+        images = html.count("<img")
+        previous_ms, previous = timed(clean_html_previous, html, args.repeat)
+        single_ms, single = timed(clean_html_single_pass, html, args.repeat)
+        totals[0] += previous_ms
+        totals[1] += single_ms
+        lines = f"{line_count(previous)}/{line_count(single)}"
+        print(
+            f"{name[:32]:<32} {len(html) / 1024:>7.0f} {images:>5} "
+            f"{previous_ms:>12.1f} {single_ms:>10.1f} "
+            f"{previous_ms / single_ms:>7.1f}x "
+            f"{word_match(previous, single):>7.1%} {lines:>13}"
+        )
+        if args.diff:
+            stem = Path(name).stem
+            (args.diff / f"{stem}.previous.txt").write_text(previous, encoding="utf-8")
+            (args.diff / f"{stem}.single.txt").write_text(single, encoding="utf-8")
+    print(
+        f"{'total':<32} {'':>7} {'':>5} {totals[0]:>12.1f} {totals[1]:>10.1f} "
+        f"{totals[0] / totals[1]:>7.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
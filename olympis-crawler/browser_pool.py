@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from playwright.async_api import Browser, Page, Playwright, async_playwright
+from playwright.async_api import Error as PlaywrightError
+
+logger = logging.getLogger(__name__)
+
+CRAWLER_BROWSER_MAX_PAGES = int(os.getenv("CRAWLER_BROWSER_MAX_PAGES", "200"))
+CRAWLER_BROWSER_MAX_MEMORY_MB = int(os.getenv("CRAWLER_BROWSER_MAX_MEMORY_MB", "1024"))
+CRAWLER_BROWSER_MEMORY_CHECK_SECONDS = float(
+    os.getenv("CRAWLER_BROWSER_MEMORY_CHECK_SECONDS", "10")
+)
+CRAWLER_BROWSER_ARGS = os.getenv(
+    "CRAWLER_BROWSER_ARGS", "--disable-dev-shm-usage --disable-gpu"
+).split()
+
+
+def _process_children() -> dict[int, list[int]]:
+    """Child pids of every process, read from /proc."""
+    children: dict[int, list[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields resume after ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _descendants(children: dict[int, list[int]], pid: int) -> set[int]:
+    found = set()
+    pending = list(children.get(pid, ()))
+    while pending:
+        child = pending.pop()
+        found.add(child)
+        pending.extend(children.get(child, ()))
+    return found
+
+
+def _driver_children() -> set[int]:
+    """Pids of the browsers the Playwright driver, a worker child, runs."""
+    children = _process_children()
+    return {
+        pid for child in children.get(os.getpid(), ()) for pid in children.get(child, ())
+    }
+
+
+def _tree_rss_bytes(roots: list[int]) -> int:
+    """Resident memory of the processes `roots` and everything below them.
+
+    Chromium runs as a tree of renderer, GPU and utility processes, so a
+    browser's footprint is the sum over its tree.
+    """
+    children = _process_children()
+    pids = set(roots)
+    for root in roots:
+        pids |= _descendants(children, root)
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+class BrowserCrashedError(PlaywrightError):
+    """A page failed because its browser disconnected without being closed."""
+
+
+class _PooledBrowser:
+    __slots__ = (
+        "browser",
+        "pids",
+        "pages",
+        "active",
+        "memory_checked_at",
+        "retired",
+        "crashed",
+    )
+
+    def __init__(self, browser: Browser, pids: list[int]):
+        self.browser = browser
+        # The browser's main processes; its renderers and helpers run below
+        self.pids = pids
+        self.pages = 0
+        self.active = 0
+        self.memory_checked_at = time.monotonic()
+        # Set before the pool closes the browser itself, so that disconnect
+        # is not taken for a crash
+        self.retired = False
+        self.crashed = False
+
+
+class BrowserPool:
+    """One long-lived Chromium per worker process, shared by concurrent pages.
+
+    Every page gets a fresh browser context, so cookies, storage and cache
+    never leak between crawls, while the browser itself is launched once.
+    The browser is retired after CRAWLER_BROWSER_MAX_PAGES pages or once
+    its processes use more than CRAWLER_BROWSER_MAX_MEMORY_MB, measured at
+    most every CRAWLER_BROWSER_MEMORY_CHECK_SECONDS: new pages go to a fresh
+    browser and the old one closes when its last page is done.
+    A crashed browser is replaced on the next page.
+
+    The pool belongs to the event loop it was first used on.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = CRAWLER_BROWSER_MAX_PAGES,
+        max_memory_mb: int = CRAWLER_BROWSER_MAX_MEMORY_MB,
+    ):
+        self.max_pages = max_pages
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self._playwright: Playwright | None = None
+        self._current: _PooledBrowser | None = None
+        self._lock = asyncio.Lock()
+        self.launches = 0
+
+    async def _launch(self) -> _PooledBrowser:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        before = await asyncio.to_thread(_driver_children)
+        browser = await self._playwright.chromium.launch(
+            headless=True, args=CRAWLER_BROWSER_ARGS
+        )
+        # Launches are serialized by the lock, so the new process is this one
+        pids = await asyncio.to_thread(_driver_children)
+        pooled = _PooledBrowser(browser, list(pids - before))
+        browser.on("disconnected", lambda _: self._on_disconnected(pooled))
+        self.launches += 1
+        logger.info("Launched browser #%s", self.launches)
+        return pooled
+
+    def _on_disconnected(self, pooled: _PooledBrowser) -> None:
+        if not pooled.retired:
+            pooled.crashed = True
+        if pooled is self._current:
+            logger.warning("Browser disconnected, relaunching on next page")
+            self._current = None
+
+    async def _acquire(self) -> _PooledBrowser:
+        async with self._lock:
+            pooled = self._current
+            if pooled is None or not pooled.browser.is_connected():
+                pooled = self._current = await self._launch()
+            pooled.active += 1
+            pooled.pages += 1
+            return pooled
+
+    async def _recycle_reason(self, pooled: _PooledBrowser) -> str | None:
+        if pooled.pages >= self.max_pages:
+            return f"{pooled.pages} pages"
+        now = time.monotonic()
+        if now - pooled.memory_checked_at < CRAWLER_BROWSER_MEMORY_CHECK_SECONDS:
+            return None
+        pooled.memory_checked_at = now
+        rss = await asyncio.to_thread(_tree_rss_bytes, pooled.pids)
+        if rss > self.max_memory_bytes:
+            return f"{rss // (1024 * 1024)} MB resident"
+        return None
+
+    async def _release(self, pooled: _PooledBrowser) -> None:
+        pooled.active -= 1
+        if pooled is self._current:
+            reason = await self._recycle_reason(pooled)
+            # Another page may have retired it while the memory was measured
+            if reason is None or pooled is not self._current:
+                return
+            logger.info("Retiring browser after %s", reason)
+            pooled.retired = True
+            self._current = None
+        if pooled.active == 0:
+            await _close_quietly(pooled.browser)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """A page in a fresh context, closed and accounted for on exit.
+
+        Errors caused by the page's browser crashing are raised as
+        BrowserCrashedError; the next page() runs on a fresh browser.
+        """
+        pooled = await self._acquire()
+        try:
+            context = await pooled.browser.new_context()
+            try:
+                yield await context.new_page()
+            finally:
+                await _close_quietly(context)
+        except PlaywrightError as e:
+            if pooled.crashed or not (
+                pooled.retired or pooled.browser.is_connected()
+            ):
+                raise BrowserCrashedError(str(e)) from e
+            raise
+        finally:
+            await self._release(pooled)
+
+    async def close(self) -> None:
+        pooled, self._current = self._current, None
+        if pooled is not None:
+            pooled.retired = True
+            await _close_quietly(pooled.browser)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+async def _close_quietly(target) -> None:
+    try:
+        await target.close()
+    except PlaywrightError:
+        # Already gone with its browser; nothing left to release
+        logger.debug("Close of %r failed", target, exc_info=True)
@@ -0,0 +1,186 @@
+"""Page text for the extractor in one walk over the parsed document.
+
+Images become inline `[IMAGE alt="..." src="..."]` markers, block elements
+start new lines, and script, style, svg and similar subtrees are skipped
+without being visited. The tree is never modified or serialized again.
+
+The text keeps the block layout of the inscriptis output it replaced:
+paragraphs, headings and figures are set off by a blank line and list items
+start with "* ". Unlike inscriptis, nested divs and lists are not indented
+and runs of blank lines collapse to one; on storefront markup both were
+mostly leading whitespace and empty lines, so the extractor sees the same
+words and lines without them. benchmarks/clean_html.py compares the two on
+saved pages.
+"""
+
+import re
+from urllib.parse import urljoin
+
+from lxml import html as LH
+
+# Subtrees that never hold visible text
+_SKIP = frozenset(
+    "script style svg noscript template head iframe object canvas".split()
+)
+_BLOCK = frozenset(
+    """
+    address article aside blockquote body dd details dialog div dl dt fieldset
+    figcaption figure footer form h1 h2 h3 h4 h5 h6 header hr html legend li
+    main nav ol p pre section summary table tbody tfoot thead tr ul
+    """.split()
+)
+# Blocks with a blank line before and after, like inscriptis' 1em margins
+_MARGIN = frozenset({"p", "figure", "h1", "h2", "h3", "h4", "h5", "h6"})
+_CELLS = frozenset({"td", "th"})
+_BULLET = "* "
+_WHITESPACE = re.compile(r"\s+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+class _TextWriter:
+    """Lines of text with HTML whitespace rules: runs collapse to one space."""
+
+    __slots__ = ("lines", "line", "space")
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.line: list[str] = []
+        self.space = False
+
+    def text(self, text: str | None) -> None:
+        if not text:
+            return
+        if text[0].isspace():
+            self.space = True
+        words = _WHITESPACE.sub(" ", text).strip()
+        if not words:
+            return
+        self.inline(words)
+        self.space = text[-1].isspace()
+
+    def inline(self, token: str) -> None:
+        if self.space and self.line and not self.line[-1].endswith(" "):
+            self.line.append(" ")
+        self.line.append(token)
+        self.space = False
+
+    def preformatted(self, text: str | None) -> None:
+        if not text:
+            return
+        first, *rest = text.split("\n")
+        self.line.append(first)
+        for line in rest:
+            self.break_line()
+            self.line.append(line)
+        self.space = False
+
+    def separate(self, separator: str) -> None:
+        if self.line:
+            self.line.append(separator)
+        self.space = False
+
+    def break_line(self) -> None:
+        """End the current line, even if empty, as <br> does."""
+        self.lines.append("".join(self.line))
+        self.line = []
+        self.space = False
+
+    def end_block(self) -> None:
+        """End the current line unless nothing was written to it.
+
+        A list bullet stays on its line until the item's content follows.
+        """
+        if self.line and self.line != [_BULLET]:
+            self.break_line()
+
+    def margin(self) -> None:
+        """End the current line and leave one blank line, as a <p> margin does.
+
+        Adjacent margins collapse into one, and a bullet keeps its item's
+        first line.
+        """
+        if self.line == [_BULLET]:
+            return
+        self.end_block()
+        if self.lines and self.lines[-1]:
+            self.lines.append("")
+
+    def bullet(self) -> None:
+        self.end_block()
+        self.line = [_BULLET]
+
+    def result(self) -> str:
+        self.end_block()
+        return _BLANK_LINES.sub("\n\n", "\n".join(self.lines)).strip()
+
+
+def html_to_text(root: LH.HtmlElement, base_url: str | None = None) -> str:
+    out = _TextWriter()
+    pre_depth = 0
+
+    def write(text: str | None) -> None:
+        if pre_depth:
+            out.preformatted(text)
+        else:
+            out.text(text)
+
+    def open_element(element: LH.HtmlElement) -> None:
+        nonlocal pre_depth
+        tag = element.tag
+        if tag == "li":
+            out.bullet()
+        elif tag in _MARGIN:
+            out.margin()
+        elif tag in _BLOCK:
+            out.end_block()
+            if tag == "pre":
+                pre_depth += 1
+        elif tag in _CELLS:
+            out.separate("  ")
+        write(element.text)
+
+    def close_element(element: LH.HtmlElement) -> None:
+        nonlocal pre_depth
+        tag = element.tag
+        if tag == "li" and out.line == [_BULLET]:
+            # An item without text leaves no bullet behind
+            out.line = []
+        elif tag in _MARGIN:
+            out.margin()
+        elif tag in _BLOCK:
+            out.end_block()
+            if tag == "pre":
+                pre_depth -= 1
+
+    open_element(root)
+    stack = [(root, iter(root))]
+    while stack:
+        element, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            close_element(element)
+            if stack:
+                write(element.tail)
+            continue
+
+        tag = child.tag
+        if not isinstance(tag, str) or tag in _SKIP:
+            # Comments and processing instructions only contribute their tail
+            write(child.tail)
+        elif tag == "img":
+            src = child.get("src") or ""
+            if src:
+                if base_url:
+                    src = urljoin(base_url, src)
+                alt = (child.get("alt") or "").strip().replace('"', '\\"')
+                out.inline(f'[IMAGE alt="{alt}" src="{src}"]')
+            write(child.tail)
+        elif tag == "br":
+            out.break_line()
+            write(child.tail)
+        else:
+            open_element(child)
+            stack.append((child, iter(child)))
+
+    return out.result()
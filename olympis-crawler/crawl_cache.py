@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Awaitable, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import redis
+from redis.exceptions import LockError
+
+logger = logging.getLogger(__name__)
+
+CRAWL_CACHE_TTL = int(os.getenv("CRAWL_CACHE_TTL", "3600"))
+CRAWL_CACHE_MAX_ENTRIES = int(os.getenv("CRAWL_CACHE_MAX_ENTRIES", "10000"))
+CRAWL_LOCK_TTL = int(os.getenv("CRAWL_LOCK_TTL", "120"))
+CRAWL_WAIT_POLL_SECONDS = float(os.getenv("CRAWL_WAIT_POLL_SECONDS", "0.25"))
+
+_INDEX_KEY = "crawl:cache:index"
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for cache keys.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_")
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _url_hash(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+class CrawlCache:
+    """Blob references of recent crawls by normalized URL.
+
+    Entries expire after CRAWL_CACHE_TTL. An index sorted by last use keeps
+    at most CRAWL_CACHE_MAX_ENTRIES entries, evicting the least recently
+    used ones. Index members unused for longer than the TTL point at expired
+    entries and are pruned on every write.
+    """
+
+    def __init__(self, connection: redis.Redis):
+        self.connection = connection
+
+    @staticmethod
+    def _key(url_hash: str) -> str:
+        return f"crawl:cache:{url_hash}"
+
+    def get(self, url_hash: str) -> str | None:
+        pipe = self.connection.pipeline(transaction=False)
+        pipe.get(self._key(url_hash))
+        pipe.zadd(_INDEX_KEY, {url_hash: time.time()}, xx=True, ch=True)
+        ref, indexed = pipe.execute()
+        if ref is None:
+            if indexed:
+                # The entry expired but its index member outlived it
+                self.connection.zrem(_INDEX_KEY, url_hash)
+            return None
+        return ref.decode() if isinstance(ref, bytes) else ref
+
+    def set(self, url_hash: str, ref: str) -> None:
+        now = time.time()
+        pipe = self.connection.pipeline(transaction=False)
+        pipe.set(self._key(url_hash), ref, ex=CRAWL_CACHE_TTL)
+        pipe.zadd(_INDEX_KEY, {url_hash: now})
+        pipe.zremrangebyscore(_INDEX_KEY, "-inf", now - CRAWL_CACHE_TTL)
+        pipe.expire(_INDEX_KEY, CRAWL_CACHE_TTL)
+        pipe.zcard(_INDEX_KEY)
+        *_, size = pipe.execute()
+
+        excess = size - CRAWL_CACHE_MAX_ENTRIES
+        if excess > 0:
+            evicted = self.connection.zpopmin(_INDEX_KEY, excess)
+            self.connection.delete(
+                *(self._key(member.decode()) for member, _ in evicted)
+            )
+
+
+async def cached_crawl(
+    connection: redis.Redis, url: str, crawl: Callable[[], Awaitable[str]]
+) -> str:
+    """Return the cached crawl of `url`, or run `crawl` once for all callers.
+
+    The first caller takes a per-URL lock and crawls. Concurrent callers for
+    the same URL wait for its result instead of starting their own browser
+    session, and only crawl themselves if the lock holder gave up. `connection`
+    is a blocking client, so every Redis call runs in a thread and never
+    stalls the other crawls on the event loop.
+    """
+    cache = CrawlCache(connection)
+    url_hash = _url_hash(url)
+
+    while True:
+        ref = await asyncio.to_thread(cache.get, url_hash)
+        if ref is not None:
+            logger.info("Crawl cache hit for %s", url)
+            return ref
+
+        # The lock's token must not be thread-local: each call may run on a
+        # different thread
+        lock = connection.lock(
+            f"crawl:lock:{url_hash}", timeout=CRAWL_LOCK_TTL, thread_local=False
+        )
+        if await asyncio.to_thread(lock.acquire, blocking=False):
+            try:
+                # The previous holder may have finished between the two checks
+                ref = await asyncio.to_thread(cache.get, url_hash)
+                if ref is None:
+                    ref = await crawl()
+                    await asyncio.to_thread(cache.set, url_hash, ref)
+                return ref
+            finally:
+                try:
+                    await asyncio.to_thread(lock.release)
+                except LockError:
+                    # The crawl outlived CRAWL_LOCK_TTL and the lock expired
+                    logger.warning("Crawl lock for %s expired before release", url)
+
+        logger.info("Waiting for in-flight crawl of %s", url)
+        while await asyncio.to_thread(lock.locked):
+            await asyncio.sleep(CRAWL_WAIT_POLL_SECONDS)
@@ -0,0 +1,183 @@
+"""RQ worker that runs many crawl jobs concurrently on one event loop.
+
+Start it with `rq worker -w crawl_worker.CrawlWorker crawler`. The worker
+dequeues as usual, then keeps pulling batches of jobs from its queues while
+it has free slots, up to CRAWLER_CONCURRENCY jobs in flight, and only goes
+back to RQ's blocking dequeue once the queues are empty and every job has
+finished. Job functions must be coroutines, which run on the worker's loop;
+plain functions fail, since a thread running one could not be stopped at
+its timeout. Each job still gets its own execution, result, callbacks and
+dependents exactly as with a regular RQ worker.
+"""
+
+import asyncio
+import inspect
+import os
+import sys
+import traceback
+from contextvars import ContextVar
+
+from rq import Retry, get_current_job
+from rq.executions import Execution
+from rq.job import Job, JobStatus
+from rq.queue import Queue
+from rq.timeouts import JobTimeoutException
+from rq.utils import now
+from rq.worker import SimpleWorker, WorkerStatus
+
+from engine import CRAWLER_CONCURRENCY, close_engine, open_engine
+
+CRAWLER_BATCH_SIZE = int(os.getenv("CRAWLER_BATCH_SIZE", "8"))
+CRAWLER_POLL_SECONDS = float(os.getenv("CRAWLER_POLL_SECONDS", "1"))
+
+_current_job: ContextVar[Job | None] = ContextVar("current_crawl_job", default=None)
+
+
+def get_current_crawl_job() -> Job | None:
+    """The job of the running crawl task, on CrawlWorker or a plain RQ worker.
+
+    RQ's get_current_job() tracks one job per thread, which is wrong when
+    several jobs share the worker's event loop.
+    """
+    return _current_job.get() or get_current_job()
+
+
+class CrawlWorker(SimpleWorker):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._runner = asyncio.Runner()
+        self._executions: dict[str, Execution] = {}
+
+    def execute_job(self, job: Job, queue: Queue):
+        self.set_state(WorkerStatus.BUSY)
+        self._runner.run(self._drain(job, queue))
+        self.set_state(WorkerStatus.IDLE)
+
+    def teardown(self):
+        self._runner.run(close_engine())
+        self._runner.close()
+        super().teardown()
+
+    async def _drain(self, job: Job, queue: Queue) -> None:
+        # The engine, and with it the browser, lives as long as the worker
+        open_engine()
+        in_flight = {asyncio.create_task(self._perform(job, queue))}
+        while in_flight:
+            free = CRAWLER_CONCURRENCY - len(in_flight)
+            if free > 0 and not self._stop_requested:
+                for pulled, origin in self._pull(min(free, CRAWLER_BATCH_SIZE)):
+                    in_flight.add(asyncio.create_task(self._perform(pulled, origin)))
+
+            _, in_flight = await asyncio.wait(
+                in_flight,
+                timeout=CRAWLER_POLL_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            self.heartbeat()
+
+    def _pull(self, count: int) -> list[tuple[Job, Queue]]:
+        """Move up to `count` waiting jobs to their intermediate queues in one round trip."""
+        pulled = []
+        for queue in self._ordered_queues:
+            if count <= len(pulled):
+                break
+            with self.connection.pipeline(transaction=False) as pipe:
+                for _ in range(count - len(pulled)):
+                    pipe.lmove(queue.key, queue.intermediate_queue_key)
+                job_ids = [
+                    job_id.decode() if isinstance(job_id, bytes) else job_id
+                    for job_id in pipe.execute()
+                    if job_id is not None
+                ]
+            if not job_ids:
+                continue
+
+            jobs = Job.fetch_many(
+                job_ids, connection=self.connection, serializer=self.serializer
+            )
+            for job_id, job in zip(job_ids, jobs):
+                if job is None:
+                    # Deleted while queued, as dequeue_any does
+                    self.connection.lrem(queue.intermediate_queue_key, 1, job_id)
+                    continue
+                job.redis_server_version = self.get_redis_server_version()
+                self.log.info("%s: %s", queue.name, job.id)
+                pulled.append((job, queue))
+        return pulled
+
+    def prepare_execution(self, job: Job) -> Execution:
+        with self.connection.pipeline() as pipeline:
+            execution = Execution.create(job, self.get_heartbeat_ttl(job), pipeline)
+            pipeline.execute()
+        self._executions[job.id] = execution
+        return execution
+
+    def cleanup_execution(self, job: Job, pipeline):
+        execution = self._executions.pop(job.id, None)
+        if execution is not None:
+            execution.delete(job=job, pipeline=pipeline)
+        if not self._executions:
+            self.set_current_job_id(None, pipeline=pipeline)
+
+    async def _perform(self, job: Job, queue: Queue) -> None:
+        """Run one job like Worker.perform_job, awaiting it instead of blocking."""
+        started_job_registry = queue.started_job_registry
+        try:
+            self.prepare_execution(job)
+            self.prepare_job_execution(job, remove_from_intermediate_queue=True)
+            job.started_at = now()
+            job.connection.persist(job.key)
+
+            token = _current_job.set(job)
+            try:
+                return_value = await self._call(job)
+            finally:
+                _current_job.reset(token)
+
+            self.handle_execution_ended(job, queue, job.success_callback_timeout)
+            job._result = return_value
+            if isinstance(return_value, Retry):
+                self.handle_job_retry(
+                    job=job,
+                    queue=queue,
+                    retry=return_value,
+                    started_job_registry=started_job_registry,
+                )
+                return
+            job.execute_success_callback(self.death_penalty_class, return_value)
+            self.handle_job_success(
+                job=job, queue=queue, started_job_registry=started_job_registry
+            )
+        except Exception:
+            job._status = JobStatus.FAILED
+            self.handle_execution_ended(job, queue, job.failure_callback_timeout)
+            exc_info = sys.exc_info()
+            exc_string = "".join(traceback.format_exception(*exc_info))
+            try:
+                job.execute_failure_callback(self.death_penalty_class, *exc_info)
+            except Exception:
+                exc_info = sys.exc_info()
+                exc_string = "".join(traceback.format_exception(*exc_info))
+
+            self.handle_exception(job, *exc_info)
+            self.handle_job_failure(
+                job=job,
+                exc_string=exc_string,
+                queue=queue,
+                started_job_registry=started_job_registry,
+            )
+
+    async def _call(self, job: Job):
+        timeout = job.timeout or self.queue_class.DEFAULT_TIMEOUT
+        if not inspect.iscoroutinefunction(job.func):
+            raise TypeError(
+                f"{job.func_name} is not a coroutine function; CrawlWorker "
+                "only runs async jobs, use a regular RQ worker for others"
+            )
+        call = job.func(*job.args, **job.kwargs)
+        try:
+            return await asyncio.wait_for(call, None if timeout == -1 else timeout)
+        except TimeoutError:
+            raise JobTimeoutException(
+                f"Task exceeded maximum timeout value ({timeout} seconds)"
+            ) from None
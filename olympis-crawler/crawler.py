@@ -1,66 +1,60 @@
-import time
-import math
+import asyncio
 import json
 import logging
-from urllib.parse import urljoin
 
-from inscriptis import get_text
 from lxml import html as LH
-from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
-from playwright.sync_api import sync_playwright
-from rq import get_current_job
 
+from cleaner import html_to_text
+from crawl_cache import cached_crawl
+from crawl_worker import get_current_crawl_job
+from engine import engine_session
+from envelope import publish_event
+from fetcher import fetch_page
+from render_profiles import get_profile
+from storage import init_storage
 
-def get_html(url: str) -> str:
-    html_content = None
-    logging.getLogger(__name__).error("########################START")
-    with sync_playwright() as p:
-        browser = None
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
 
-        try:
-            page.goto(url, wait_until="networkidle", timeout=8000)
-        except PlaywrightTimeoutError:
-            page.goto(url, wait_until="domcontentloaded", timeout=8000)
-        except Exception:
-            # log Exception
-            raise
+async def get_html(url: str, profile: str | None = None) -> str:
+    async with engine_session():
+        result = await fetch_page(url, get_profile(profile))
+    logging.getLogger(__name__).info(
+        "Fetched %s via %s in %s", url, result.tier, result.timings_ms
+    )
 
-        page.wait_for_timeout(2000)
-        html_content = page.content()
-
-        if browser:
-            browser.close()
-
-    return html_content
+    # Keep the tier and timings of each URL with the job for later analysis
+    job = get_current_crawl_job()
+    if job is not None:
+        job.meta.setdefault("fetches", {})[url] = result.summary()
+        await asyncio.to_thread(job.save_meta)
+    return result.html
 
 
 def clean_html(html: str, base_url: str | None = None):
     doc = LH.fromstring(html, base_url=base_url)
-    base = doc.base_url
+    return html_to_text(doc, doc.base_url)
+
+
+async def get_cleaned_html(url: str, events_id: str | None = None):
+    job = get_current_crawl_job()
+    if job is not None:
+        await asyncio.to_thread(
+            publish_event,
+            job.connection,
+            events_id or job.id,
+            "progress",
+            "crawl",
+            {"message": "Crawling page"},
+        )
 
-    for img in doc.xpath("//img"):
-        src = img.get("src") or ""
-        if src == "":
-            continue
-        if base:
-            src = urljoin(base, src)
-        alt = (img.get("alt") or "").strip().replace('"', '\\"')
-        marker = f'[IMAGE alt="{alt}" src="{src}"]'
-        # Replace the <img> with a simple inline text node
-        parent = img.getparent()
-        i = parent.index(img)
-        parent.remove(img)
-        parent.insert(i, LH.fromstring(f"<span>{marker}</span>"))
+    if job is None:
+        return await _crawl(url)
+    return await cached_crawl(job.connection, url, lambda: _crawl(url))
 
-    return get_text(LH.tostring(doc, encoding="unicode"))
 
+async def _crawl(url: str) -> str:
+    # this simulates browser rendering for 2 seconds, which is spent waiting
+    # on the page and leaves the event loop free for other crawls
+    await asyncio.sleep(2)
 
-def get_cleaned_html(url: str, events_id: str | None = None):
-    # this simulates heavy browser rendering for 2 seconds
-    end_time = time.time() + 2
-    while time.time() < end_time:
-        math.sqrt(12345.6789) * math.sqrt(98765.4321)
-        time.sleep(0.1)
-    return "CLEANED HTML"
+    # Later stages receive a reference; the page itself stays out of Redis
+    return await asyncio.to_thread(init_storage().put_text, "CLEANED HTML")
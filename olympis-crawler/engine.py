@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from browser_pool import BrowserCrashedError, BrowserPool
+from render_profiles import RenderProfile, get_profile, load_page
+
+logger = logging.getLogger(__name__)
+
+CRAWLER_CONCURRENCY = int(os.getenv("CRAWLER_CONCURRENCY", "16"))
+CRAWLER_DOMAIN_CONCURRENCY = int(os.getenv("CRAWLER_DOMAIN_CONCURRENCY", "2"))
+
+
+class DomainLimiter:
+    """At most `limit` concurrent holders per domain.
+
+    A domain's semaphore only exists while someone holds or waits for it,
+    so crawling many distinct domains does not grow the map.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._domains: dict[str, tuple[asyncio.Semaphore, list[int]]] = {}
+
+    @asynccontextmanager
+    async def hold(self, domain: str) -> AsyncIterator[None]:
+        entry = self._domains.get(domain)
+        if entry is None:
+            entry = self._domains[domain] = (asyncio.Semaphore(self.limit), [0])
+        semaphore, users = entry
+        users[0] += 1
+        try:
+            async with semaphore:
+                yield
+        finally:
+            users[0] -= 1
+            if users[0] == 0:
+                del self._domains[domain]
+
+
+def url_domain(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+class CrawlEngine:
+    """Renders many pages concurrently on one shared browser.
+
+    At most CRAWLER_CONCURRENCY pages render at once, and at most
+    CRAWLER_DOMAIN_CONCURRENCY requests go to the same host, so a batch of
+    jobs for one store does not hammer it. `domains` is shared with the
+    plain HTTP fetches of the fetcher.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = CRAWLER_CONCURRENCY,
+        domain_concurrency: int = CRAWLER_DOMAIN_CONCURRENCY,
+    ):
+        self.pool = BrowserPool()
+        self._slots = asyncio.Semaphore(concurrency)
+        self.domains = DomainLimiter(domain_concurrency)
+
+    async def render(self, url: str, profile: RenderProfile | None = None) -> str:
+        """The HTML of `url` after rendering, retried once if the browser crashed."""
+        profile = profile or get_profile()
+        async with self.domains.hold(url_domain(url)), self._slots:
+            try:
+                return await self._render(url, profile)
+            except BrowserCrashedError:
+                # The browser died under this page; retry once on a fresh one
+                logger.warning("Browser crashed on %s, retrying", url)
+                return await self._render(url, profile)
+
+    async def _render(self, url: str, profile: RenderProfile) -> str:
+        async with self.pool.page() as page:
+            await load_page(page, url, profile)
+            return await page.content()
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+
+_engines: dict[asyncio.AbstractEventLoop, CrawlEngine] = {}
+
+
+def get_engine() -> CrawlEngine:
+    """The crawl engine of the running event loop.
+
+    It exists on CrawlWorker's loop for the worker's whole life, and
+    elsewhere only inside engine_session().
+    """
+    engine = _engines.get(asyncio.get_running_loop())
+    if engine is None:
+        raise RuntimeError("No crawl engine on this event loop")
+    return engine
+
+
+def open_engine() -> CrawlEngine:
+    """Give the running loop an engine that lives until close_engine()."""
+    loop = asyncio.get_running_loop()
+    engine = _engines.get(loop)
+    if engine is None:
+        engine = _engines[loop] = CrawlEngine()
+    return engine
+
+
+async def close_engine() -> None:
+    engine = _engines.pop(asyncio.get_running_loop(), None)
+    if engine is not None:
+        await engine.close()
+
+
+@asynccontextmanager
+async def engine_session() -> AsyncIterator[CrawlEngine]:
+    """The loop's engine, or a temporary one closed when the block ends.
+
+    A plain RQ worker runs every job on a new event loop; without this its
+    browser and Playwright driver would outlive the job.
+    """
+    loop = asyncio.get_running_loop()
+    engine = _engines.get(loop)
+    if engine is not None:
+        yield engine
+        return
+    engine = _engines[loop] = CrawlEngine()
+    try:
+        yield engine
+    finally:
+        del _engines[loop]
+        await engine.close()
@@ -0,0 +1,196 @@
+"""Tiered page fetching: a plain HTTP GET first, the browser only when needed.
+
+Most storefronts render on the server, so their HTML already holds all the
+text the cleaner needs. The HTTP response is scored for completeness and
+the page is only rendered in the browser if it looks like a client-side app
+shell, hides its content behind a noscript wall or has too little text.
+"""
+
+import asyncio
+import codecs
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+import requests
+from lxml import etree
+from lxml import html as LH
+from requests.adapters import HTTPAdapter
+
+from engine import CRAWLER_CONCURRENCY, get_engine, url_domain
+from render_profiles import RenderProfile
+
+logger = logging.getLogger(__name__)
+
+CRAWLER_HTTP_TIMEOUT = float(os.getenv("CRAWLER_HTTP_TIMEOUT", "10"))
+CRAWLER_HTTP_MAX_BYTES = int(os.getenv("CRAWLER_HTTP_MAX_BYTES", str(5 * 1024 * 1024)))
+CRAWLER_HTTP_MIN_TEXT = int(os.getenv("CRAWLER_HTTP_MIN_TEXT", "1500"))
+CRAWLER_HTTP_MIN_DENSITY = float(os.getenv("CRAWLER_HTTP_MIN_DENSITY", "0.005"))
+CRAWLER_USER_AGENT = os.getenv(
+    "CRAWLER_USER_AGENT",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36",
+)
+
+# Element ids single-page app frameworks mount into
+_APP_MOUNT_IDS = ("root", "app", "__next", "__nuxt", "___gatsby", "svelte")
+_NOSCRIPT_WALL_PHRASES = (
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    "requires javascript",
+    "turn on javascript",
+)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+_VISIBLE_TEXT = (
+    "//body//text()[not(ancestor::script or ancestor::style"
+    " or ancestor::noscript or ancestor::template)]"
+)
+
+
+class FetchError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class Completeness:
+    text_chars: int
+    density: float
+    reasons: list[str]
+
+    @property
+    def complete(self) -> bool:
+        return not self.reasons
+
+
+@dataclass(slots=True)
+class FetchResult:
+    """A fetched page, the tier that produced it and how long each tier took."""
+
+    url: str
+    html: str
+    tier: str
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    escalation: list[str] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "tier": self.tier,
+            "timings_ms": self.timings_ms,
+            "escalation": self.escalation,
+        }
+
+
+def score_html(html: bytes | str) -> Completeness:
+    """Whether server-rendered HTML already carries the page's content."""
+    size = len(html)
+    if size == 0:
+        return Completeness(0, 0.0, ["empty response"])
+    doc = LH.document_fromstring(html)
+
+    text_chars = sum(len(text.strip()) for text in doc.xpath(_VISIBLE_TEXT))
+    density = text_chars / size
+    reasons = []
+    if text_chars < CRAWLER_HTTP_MIN_TEXT:
+        reasons.append(f"{text_chars} text chars")
+        # Only a near-empty page is a shell; a large one just mounts widgets
+        for mount_id in _APP_MOUNT_IDS:
+            mount = doc.get_element_by_id(mount_id, None)
+            if mount is not None and len(mount.text_content().strip()) < 50:
+                reasons.append(f"app shell #{mount_id}")
+                break
+    elif density < CRAWLER_HTTP_MIN_DENSITY:
+        reasons.append(f"text density {density:.4f}")
+
+    for noscript in doc.iter("noscript"):
+        text = noscript.text_content().lower()
+        if any(phrase in text for phrase in _NOSCRIPT_WALL_PHRASES):
+            if text_chars < CRAWLER_HTTP_MIN_TEXT * 2:
+                reasons.append("noscript wall")
+            break
+    return Completeness(text_chars, density, reasons)
+
+
+_session: requests.Session | None = None
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=CRAWLER_CONCURRENCY)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+        _session.headers.update(
+            {
+                "User-Agent": CRAWLER_USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            }
+        )
+    return _session
+
+
+def _http_get(url: str) -> tuple[str, Completeness]:
+    with _get_session().get(
+        url, timeout=CRAWLER_HTTP_TIMEOUT, stream=True, allow_redirects=True
+    ) as response:
+        if response.status_code != 200:
+            raise FetchError(f"HTTP {response.status_code}")
+        content_type = response.headers.get("Content-Type", "")
+        if "html" not in content_type:
+            raise FetchError(f"content type {content_type!r}")
+
+        body = bytearray()
+        for chunk in response.iter_content(64 * 1024):
+            body += chunk
+            if len(body) > CRAWLER_HTTP_MAX_BYTES:
+                raise FetchError(f"larger than {CRAWLER_HTTP_MAX_BYTES} bytes")
+        encoding = response.encoding if "charset" in content_type else None
+
+    body = bytes(body)
+    completeness = score_html(body)
+    return body.decode(encoding or _sniff_charset(body), errors="replace"), completeness
+
+
+def _sniff_charset(body: bytes) -> str:
+    # Without a declared charset, browsers go by the meta tag near the top
+    match = _META_CHARSET.search(body, 0, 4096)
+    if match is not None:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+async def fetch_page(url: str, profile: RenderProfile | None = None) -> FetchResult:
+    """Fetch `url` over plain HTTP, escalating to the browser if incomplete."""
+    engine = get_engine()
+    escalation = []
+    timings = {}
+
+    start = time.perf_counter()
+    try:
+        # Same per-host cap as rendering; released before any escalation
+        async with engine.domains.hold(url_domain(url)):
+            html, completeness = await asyncio.to_thread(_http_get, url)
+    except (requests.RequestException, FetchError, etree.LxmlError) as e:
+        escalation.append(str(e) or type(e).__name__)
+    else:
+        escalation.extend(completeness.reasons)
+    timings["http"] = _elapsed_ms(start)
+    if not escalation:
+        return FetchResult(url, html, "http", timings)
+
+    start = time.perf_counter()
+    html = await engine.render(url, profile)
+    timings["browser"] = _elapsed_ms(start)
+    logger.info("Escalated %s to the browser: %s", url, ", ".join(escalation))
+    return FetchResult(url, html, "browser", timings, escalation)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
@@ -0,0 +1,189 @@
+import logging
+import os
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+CRAWLER_RENDER_PROFILE = os.getenv("CRAWLER_RENDER_PROFILE", "storefront")
+
+# Hosts whose requests never contribute page text: analytics, tag managers,
+# ad networks and session recorders. Subdomains are blocked as well.
+TRACKER_HOSTS = frozenset(
+    {
+        "google-analytics.com",
+        "googletagmanager.com",
+        "googleadservices.com",
+        "googlesyndication.com",
+        "doubleclick.net",
+        "adservice.google.com",
+        "facebook.net",
+        "connect.facebook.net",
+        "analytics.tiktok.com",
+        "ct.pinterest.com",
+        "bat.bing.com",
+        "clarity.ms",
+        "hotjar.com",
+        "segment.com",
+        "segment.io",
+        "fullstory.com",
+        "mouseflow.com",
+        "nr-data.net",
+        "criteo.com",
+        "criteo.net",
+        "taboola.com",
+        "outbrain.com",
+        "sc-static.net",
+        "snapchat.com",
+        "amazon-adsystem.com",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RenderProfile:
+    """How to load a page: what to block and when it counts as rendered.
+
+    A page is ready once one of `ready_selectors` is present (or right away
+    if there are none) and the DOM has not changed for `quiet_ms`, or after
+    `max_wait_ms` at the latest.
+    """
+
+    name: str
+    blocked_resource_types: frozenset[str] = frozenset()
+    blocked_hosts: frozenset[str] = frozenset()
+    ready_selectors: tuple[str, ...] = ()
+    quiet_ms: int = 500
+    max_wait_ms: int = 5000
+    navigation_timeout_ms: int = 8000
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        # Everything loads; for debugging pages that render wrongly
+        RenderProfile(name="full", quiet_ms=1000),
+        # Text only: no images, fonts or media, no trackers
+        RenderProfile(
+            name="text",
+            blocked_resource_types=frozenset({"image", "media", "font"}),
+            blocked_hosts=TRACKER_HOSTS,
+        ),
+        # Text only, and wait for the main content of common storefront themes
+        RenderProfile(
+            name="storefront",
+            blocked_resource_types=frozenset({"image", "media", "font"}),
+            blocked_hosts=TRACKER_HOSTS,
+            ready_selectors=(
+                "main",
+                "#MainContent",
+                "[role=main]",
+                "[data-product-id]",
+                ".product-grid",
+                ".product",
+            ),
+        ),
+    )
+}
+
+
+def get_profile(name: str | None = None) -> RenderProfile:
+    name = name or CRAWLER_RENDER_PROFILE
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown render profile: {name!r}") from None
+
+
+def _host_blocked(host: str, blocked: frozenset[str]) -> bool:
+    # Checks the host and each parent domain, e.g. a.b.c.com -> b.c.com -> c.com
+    while host:
+        if host in blocked:
+            return True
+        _, _, host = host.partition(".")
+    return False
+
+
+async def apply_profile(page: Page, profile: RenderProfile) -> None:
+    """Abort the requests `profile` blocks before they leave the browser."""
+    if not profile.blocked_resource_types and not profile.blocked_hosts:
+        return
+
+    async def handle(route: Route) -> None:
+        request = route.request
+        if request.resource_type in profile.blocked_resource_types:
+            await route.abort("blockedbyclient")
+            return
+        if profile.blocked_hosts:
+            host = urlsplit(request.url).hostname or ""
+            if _host_blocked(host, profile.blocked_hosts):
+                await route.abort("blockedbyclient")
+                return
+        await route.continue_()
+
+    await page.route("**/*", handle)
+
+
+# Resolves once the DOM has been quiet for quietMs with the main content
+# present, or after maxWaitMs
+_READY_SCRIPT = """
+([selectors, quietMs, maxWaitMs]) => new Promise((resolve) => {
+  const start = performance.now();
+  let lastMutation = start;
+  const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+  observer.observe(document, { childList: true, subtree: true, characterData: true });
+  const hasContent = () =>
+    selectors.length === 0 || selectors.some((s) => document.querySelector(s) !== null);
+  const check = () => {
+    const now = performance.now();
+    const content = hasContent();
+    if ((content && now - lastMutation >= quietMs) || now - start >= maxWaitMs) {
+      observer.disconnect();
+      resolve({ elapsed: Math.round(now - start), content });
+      return;
+    }
+    setTimeout(check, 50);
+  };
+  check();
+})
+"""
+
+
+async def wait_until_ready(page: Page, profile: RenderProfile) -> None:
+    """Wait for the page to settle as `profile` defines it."""
+    try:
+        result = await page.evaluate(
+            _READY_SCRIPT,
+            [list(profile.ready_selectors), profile.quiet_ms, profile.max_wait_ms],
+        )
+    except PlaywrightError:
+        # A client-side redirect replaced the document mid-wait; the new one
+        # has at least been parsed by now
+        logger.debug("Readiness check on %s interrupted", page.url, exc_info=True)
+        return
+    if not result["content"]:
+        logger.info(
+            "No main content on %s after %s ms", page.url, result["elapsed"]
+        )
+
+
+async def load_page(page: Page, url: str, profile: RenderProfile) -> None:
+    """Navigate to `url` and wait until it is ready to be read.
+
+    A navigation that times out keeps whatever has loaded so far instead of
+    navigating again.
+    """
+    await apply_profile(page, profile)
+    try:
+        await page.goto(
+            url, wait_until="domcontentloaded", timeout=profile.navigation_timeout_ms
+        )
+    except PlaywrightTimeoutError:
+        if page.url == "about:blank":
+            raise
+        logger.info("Navigation to %s timed out, using the partial page", url)
+    await wait_until_ready(page, profile)
@@ -0,0 +1,28 @@
+"""Add user store keyset index
+
+Revision ID: 5e2b9f03a6c4
+Revises: c41e8a7d2f10
+Create Date: 2026-10-17 11:03:54.118620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b9f03a6c4'
+down_revision: Union[str, Sequence[str], None] = 'c41e8a7d2f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_association_user_store_user_id_created_at_store_id', 'association_user_store', ['user_id', 'created_at', 'store_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_association_user_store_user_id_created_at_store_id', table_name='association_user_store')
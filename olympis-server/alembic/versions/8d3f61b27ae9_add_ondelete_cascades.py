@@ -0,0 +1,43 @@
+"""Add ondelete cascades
+
+Revision ID: 8d3f61b27ae9
+Revises: 5e2b9f03a6c4
+Create Date: 2026-10-17 13:41:07.552903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f61b27ae9'
+down_revision: Union[str, Sequence[str], None] = '5e2b9f03a6c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (constraint, source table, referred table, local column, ondelete)
+_FOREIGN_KEYS = [
+    ('association_user_store_store_id_fkey', 'association_user_store', 'stores', 'store_id', 'CASCADE'),
+    ('campaigns_store_id_fkey', 'campaigns', 'stores', 'store_id', 'CASCADE'),
+    ('stores_metadata_store_id_fkey', 'stores_metadata', 'stores', 'store_id', 'CASCADE'),
+    ('campaigns_metadata_campaign_id_fkey', 'campaigns_metadata', 'campaigns', 'campaign_id', 'CASCADE'),
+    ('stores_job_id_fkey', 'stores', 'jobs', 'job_id', 'SET NULL'),
+    ('campaigns_job_id_fkey', 'campaigns', 'jobs', 'job_id', 'SET NULL'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, source, referent, column, ondelete in _FOREIGN_KEYS:
+        op.drop_constraint(name, source, type_='foreignkey')
+        op.create_foreign_key(name, source, referent, [column], ['id'], ondelete=ondelete)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, source, referent, column, _ in reversed(_FOREIGN_KEYS):
+        op.drop_constraint(name, source, type_='foreignkey')
+        op.create_foreign_key(name, source, referent, [column], ['id'])
@@ -0,0 +1,28 @@
+"""Add campaign keyset index
+
+Revision ID: c41e8a7d2f10
+Revises: 4fc13cff3a8e
+Create Date: 2026-10-17 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e8a7d2f10'
+down_revision: Union[str, Sequence[str], None] = '4fc13cff3a8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_campaigns_store_id_created_at_id', 'campaigns', ['store_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_campaigns_store_id_created_at_id', table_name='campaigns')
@@ -1,11 +1,17 @@
 import asyncio
 import uuid
 
-from rq import Queue, get_current_job
+import redis
+from redis.client import Pipeline
+from rq import get_current_job
 from sqlalchemy import JSON
 
 from app.db.database import get_queue_database_session
-from app.jobs.service import delete_job, update_job_progress
+from app.jobs.service import (
+    delete_job,
+    enqueue_setup_pipeline,
+    update_job_progress,
+)
 
 from .service import complete_campaign_setup
 
@@ -19,31 +25,30 @@ async def async_save_data(
 
 
 def save_data(store_id: uuid.UUID, setup_job_id: uuid.UUID):
-    update_job_progress({"progress": "Saving data"}, events_id=setup_job_id)
+    update_job_progress(
+        "progress", "save", {"message": "Saving data"}, events_id=setup_job_id
+    )
     job = get_current_job()
     if job is None:
         raise
     deps = job.fetch_dependencies()
     data = deps[0].result
     asyncio.run(async_save_data(store_id, setup_job_id, data))
-    update_job_progress({"status": "done"}, events_id=setup_job_id)
-
-
-def get_campaign_metadata(url: str, campaign_id: uuid.UUID, setup_job_id: uuid.UUID):
-    job = get_current_job()
-
-    if job is None:
-        raise
-
-    q_crawler = Queue("crawler", connection=job.connection)
-    q_agents = Queue("agents", connection=job.connection)
-    q = Queue("default", connection=job.connection)
-
-    job_crawl = q_crawler.enqueue("crawler.get_cleaned_html", url, setup_job_id)
-    job_agents = q_agents.enqueue(
-        "agents.store_extractor.service.extract_store_data",
-        None,
+    update_job_progress("done", "save", events_id=setup_job_id)
+
+
+def enqueue_campaign_setup(
+    connection: redis.Redis,
+    url: str,
+    campaign_id: uuid.UUID,
+    setup_job_id: uuid.UUID,
+    pipeline: Pipeline | None = None,
+) -> None:
+    enqueue_setup_pipeline(
+        connection,
+        url,
         setup_job_id,
-        depends_on=job_crawl,
+        save_data,
+        (campaign_id, setup_job_id),
+        pipeline=pipeline,
     )
-    q.enqueue(save_data, campaign_id, setup_job_id, depends_on=job_agents)
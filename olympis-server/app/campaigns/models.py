@@ -2,7 +2,7 @@ from typing import Any
 import uuid
 import enum
 
-from sqlalchemy import ForeignKey, String, Enum as SAEnum
+from sqlalchemy import ForeignKey, Index, String, Enum as SAEnum
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,6 +19,9 @@ class CampaignState(str, enum.Enum):
 
 class Campaign(Base, TimestampMixin):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        Index("ix_campaigns_store_id_created_at_id", "store_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -37,21 +40,27 @@ class Campaign(Base, TimestampMixin):
         default=CampaignState.setup,
     )
 
-    job_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("jobs.id"))
+    job_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("jobs.id", ondelete="SET NULL")
+    )
     job: Mapped[Job | None] = relationship(cascade="delete")
 
     store_id: Mapped[uuid.UUID] = mapped_column(
-        PG_UUID(as_uuid=True), ForeignKey("stores.id")
+        PG_UUID(as_uuid=True), ForeignKey("stores.id", ondelete="CASCADE")
     )
     store: Mapped["Store"] = relationship(back_populates="campaigns")
 
-    campaign_meta: Mapped["CampaignMetaData"] = relationship(cascade="save-update, delete")
+    campaign_meta: Mapped["CampaignMetaData"] = relationship(
+        cascade="save-update, delete", passive_deletes=True
+    )
 
 
 class CampaignMetaData(Base, TimestampMixin):
     __tablename__ = "campaigns_metadata"
 
     campaign_id: Mapped[uuid.UUID] = mapped_column(
-        PG_UUID(as_uuid=True), ForeignKey("campaigns.id"), primary_key=True
+        PG_UUID(as_uuid=True),
+        ForeignKey("campaigns.id", ondelete="CASCADE"),
+        primary_key=True,
     )
     data: Mapped[dict[str, Any]] = mapped_column(JSONB)
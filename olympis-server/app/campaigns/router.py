@@ -3,11 +3,12 @@ import uuid
 from fastapi import APIRouter, Request
 from rq import Queue
 
-from app.db.dependencies import DatabaseDependency
+from app.db.dependencies import CacheDependency, DatabaseDependency
+from app.jobs.service import announce_setup_job, store_jobs_stream
 from app.logger import get_logger
 from app.user.dependencies import UserDependency
 
-from .jobs import get_campaign_metadata
+from .jobs import enqueue_campaign_setup
 from .schema import CreateCampaignRequest, CreateCampaignResponse
 from .service import create_campaign
 
@@ -19,13 +20,13 @@ router = APIRouter()
 async def get_campaigns(
     store_id: str, user: UserDependency, session: DatabaseDependency
 ):
-    logger.info(f"Campaign data requested for store: {store_id} by user: {user.id}")
+    logger.info("Campaign data requested for store: %s by user: %s", store_id, user.id)
     try:
         # TODO: Implement actual campaign fetching logic
-        logger.info(f"Processing campaign request for store: {store_id}")
+        logger.info("Processing campaign request for store: %s", store_id)
         return {"S_ID": store_id}
     except Exception:
-        logger.exception(f"Error getting campaigns for store: {store_id}")
+        logger.exception("Error getting campaigns for store: %s", store_id)
         raise
 
 
@@ -35,29 +36,38 @@ async def create_new_campaign(
     campaign_data: CreateCampaignRequest,
     user: UserDependency,
     session: DatabaseDependency,
+    cache: CacheDependency,
 ) -> CreateCampaignResponse:
     logger.info(
-        f"Campaign creation requested by user: {user.id}, campaign name: {campaign_data.name}, store: {campaign_data.store_id}"
+        "Campaign creation requested by user: %s, campaign name: %s, store: %s",
+        user.id,
+        campaign_data.name,
+        campaign_data.store_id,
     )
 
     try:
         store_uuid = uuid.UUID(str(campaign_data.store_id))
     except ValueError:
-        logger.warning(f"Invalid store_id format: {campaign_data.store_id}")
+        logger.warning("Invalid store_id format: %s", campaign_data.store_id)
         raise ValueError("Invalid store ID format")
 
-    campaign = await create_campaign(user.id, store_uuid, campaign_data, session)
+    campaign = await create_campaign(user.id, store_uuid, campaign_data, session, cache)
 
     # TODO change https addition
     q: Queue = request.app.state.app_state.queue
-    q.enqueue(
-        get_campaign_metadata,
+    pipe = q.connection.pipeline()
+    enqueue_campaign_setup(
+        q.connection,
         "https://" + campaign_data.url,
         campaign.id,
         campaign.setup_job_id,
-        job_id=str(campaign.setup_job_id),
+        pipeline=pipe,
     )
+    announce_setup_job(pipe, store_jobs_stream(store_uuid), campaign.setup_job_id)
+    pipe.execute()
 
-    logger.info(f"Queued metadata job {campaign.setup_job_id} for store {campaign.id}")
+    logger.info(
+        "Queued setup pipeline %s for campaign %s", campaign.setup_job_id, campaign.id
+    )
 
     return campaign
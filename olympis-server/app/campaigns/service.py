@@ -5,9 +5,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.campaigns.models import Campaign, CampaignMetaData, CampaignState
+from app.db.cache import Cache
 from app.exceptions import ResourceNotFoundError, UnauthorizedError
 from app.jobs.models import Job
 from app.logger import get_logger
+from app.stores.cache import invalidate_store_cache
 from app.user.models import AssociationUserStore
 
 from .schema import CreateCampaignRequest, CreateCampaignResponse
@@ -20,9 +22,13 @@ async def create_campaign(
     store_id: uuid.UUID,
     campaign_data: CreateCampaignRequest,
     session: AsyncSession,
+    cache: Cache,
 ) -> CreateCampaignResponse:
     logger.info(
-        f"Creating new campaign for user: {user_id}, store: {store_id}, campaign name: {campaign_data.name}"
+        "Creating new campaign for user: %s, store: %s, campaign name: %s",
+        user_id,
+        store_id,
+        campaign_data.name,
     )
 
     try:
@@ -35,13 +41,15 @@ async def create_campaign(
         association = association_result.scalar_one_or_none()
 
         if not association:
-            logger.warning(f"User {user_id} does not have access to store {store_id}")
+            logger.warning(
+                "User %s does not have access to store %s", user_id, store_id
+            )
             raise ResourceNotFoundError(f"Store {store_id} not found")
 
         setup_job = Job()
         session.add(setup_job)
         await session.flush()
-        logger.info(f"Job created with id: {setup_job.id}")
+        logger.info("Job created with id: %s", setup_job.id)
 
         new_campaign = Campaign(
             name=campaign_data.name,
@@ -54,9 +62,11 @@ async def create_campaign(
         session.add(new_campaign)
         await session.commit()
         logger.info(
-            f"Campaign {new_campaign.id} created successfully for user {user_id}"
+            "Campaign %s created successfully for user %s", new_campaign.id, user_id
         )
 
+        await invalidate_store_cache(cache, store_ids=[store_id])
+
         return CreateCampaignResponse(
             id=new_campaign.id,
             name=new_campaign.name,
@@ -69,17 +79,48 @@ async def create_campaign(
         raise
     except Exception:
         logger.exception(
-            f"Error creating campaign for user: {user_id}, store: {store_id}"
+            "Error creating campaign for user: %s, store: %s", user_id, store_id
         )
         await session.rollback()
         raise
 
 
+async def get_active_campaign_job_ids(
+    user_id: uuid.UUID, store_id: uuid.UUID, session: AsyncSession, limit: int
+) -> list[uuid.UUID]:
+    """Setup jobs of the store's campaigns that are still being set up.
+
+    The membership row is outer joined, so a store the user cannot see
+    returns no row at all rather than an empty job list.
+    """
+    query = (
+        select(Campaign.job_id)
+        .select_from(AssociationUserStore)
+        .outerjoin(
+            Campaign,
+            (Campaign.store_id == AssociationUserStore.store_id)
+            & (Campaign.status == CampaignState.setup)
+            & Campaign.job_id.is_not(None),
+        )
+        .where(
+            AssociationUserStore.user_id == user_id,
+            AssociationUserStore.store_id == store_id,
+        )
+        .order_by(Campaign.created_at.desc())
+        .limit(limit)
+    )
+    rows = (await session.execute(query)).scalars().all()
+    if not rows:
+        logger.warning("User %s does not have access to store %s", user_id, store_id)
+        raise ResourceNotFoundError(f"Store {store_id} not found")
+    return [job_id for job_id in rows if job_id is not None]
+
+
 async def complete_campaign_setup(
     campaign_id: uuid.UUID, extracted_data: dict, session: AsyncSession
 ) -> None:
-    logger.info(f"Completing setup for campaign: {campaign_id}")
-    logger.info(f"Extracted data to save {extracted_data}")
+    logger.info("Completing setup for campaign: %s", campaign_id)
+    logger.debug("Extracted data to save: %s keys", len(extracted_data or {}))
 
     try:
         campaign_query = (
@@ -91,17 +132,17 @@ async def complete_campaign_setup(
         campaign = campaign_result.scalar_one_or_none()
 
         if not campaign:
-            logger.warning(f"Campaign {campaign_id} not found")
+            logger.warning("Campaign %s not found", campaign_id)
             raise ResourceNotFoundError(f"Campaign {campaign_id} not found")
 
         campaign.status = CampaignState.active
         campaign.job_id = None
 
         if campaign.campaign_meta:
-            logger.info(f"Updating existing metadata for campaign {campaign_id}")
+            logger.info("Updating existing metadata for campaign %s", campaign_id)
             campaign.campaign_meta.data = extracted_data
         else:
-            logger.info(f"Creating new metadata for campaign {campaign_id}")
+            logger.info("Creating new metadata for campaign %s", campaign_id)
             campaign_metadata = CampaignMetaData(
                 campaign_id=campaign_id, data=extracted_data
             )
@@ -109,12 +150,14 @@ async def complete_campaign_setup(
             campaign.campaign_meta = campaign_metadata
 
         await session.commit()
-        logger.info(f"Campaign setup completed successfully for campaign {campaign_id}")
+        logger.info(
+            "Campaign setup completed successfully for campaign %s", campaign_id
+        )
 
     except ResourceNotFoundError:
         await session.rollback()
         raise
     except Exception:
-        logger.exception(f"Error completing campaign setup for campaign {campaign_id}")
+        logger.exception("Error completing campaign setup for campaign %s", campaign_id)
         await session.rollback()
         raise
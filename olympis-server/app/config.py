@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 # Database configuration
 POSTGRES_DB = os.getenv("POSTGRES_DB", "olympis")
@@ -8,23 +8,96 @@ POSTGRES_USER = os.getenv("POSTGRES_USER", "olympis")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "olympis")
 POSTGRES_SERVER = os.getenv("POSTGRES_SERVER", "localhost")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
-DB_ECHO = True
+DB_ECHO = os.getenv("DB_ECHO", "False").lower() == "true"
+
+# Connection pool configuration, tuned separately for the API and RQ workers
+API_DB_POOL_SIZE = int(os.getenv("API_DB_POOL_SIZE", "10"))
+API_DB_MAX_OVERFLOW = int(os.getenv("API_DB_MAX_OVERFLOW", "20"))
+API_DB_POOL_TIMEOUT = float(os.getenv("API_DB_POOL_TIMEOUT", "10"))
+API_DB_POOL_RECYCLE = int(os.getenv("API_DB_POOL_RECYCLE", "1800"))
+API_DB_POOL_PRE_PING = os.getenv("API_DB_POOL_PRE_PING", "True").lower() == "true"
+API_DB_STATEMENT_CACHE_SIZE = int(os.getenv("API_DB_STATEMENT_CACHE_SIZE", "100"))
+
+WORKER_DB_POOL_SIZE = int(os.getenv("WORKER_DB_POOL_SIZE", "2"))
+WORKER_DB_MAX_OVERFLOW = int(os.getenv("WORKER_DB_MAX_OVERFLOW", "2"))
+WORKER_DB_POOL_TIMEOUT = float(os.getenv("WORKER_DB_POOL_TIMEOUT", "30"))
+WORKER_DB_POOL_RECYCLE = int(os.getenv("WORKER_DB_POOL_RECYCLE", "1800"))
+WORKER_DB_POOL_PRE_PING = (
+    os.getenv("WORKER_DB_POOL_PRE_PING", "True").lower() == "true"
+)
+WORKER_DB_STATEMENT_CACHE_SIZE = int(
+    os.getenv("WORKER_DB_STATEMENT_CACHE_SIZE", "100")
+)
 
 # Redis configuration
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
 
-# S3 configuration
+# User resolution cache configuration
+USER_CACHE_LOCAL_TTL = float(os.getenv("USER_CACHE_LOCAL_TTL", "60"))
+USER_CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("USER_CACHE_LOCAL_MAX_ENTRIES", "10000"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "86400"))
+
+# Maximum number of stores accepted by POST /stores/batch
+STORE_BATCH_MAX_ITEMS = int(os.getenv("STORE_BATCH_MAX_ITEMS", "500"))
+
+# Store response cache configuration
+STORE_CACHE_TTL = int(os.getenv("STORE_CACHE_TTL", "300"))
+
+# Job event streaming configuration
+SSE_READER_BLOCK_MS = int(os.getenv("SSE_READER_BLOCK_MS", "5000"))
+SSE_READER_COUNT = int(os.getenv("SSE_READER_COUNT", "100"))
+SSE_SUBSCRIBER_BUFFER = int(os.getenv("SSE_SUBSCRIBER_BUFFER", "1000"))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+SSE_REPLAY_MAX = int(os.getenv("SSE_REPLAY_MAX", "100"))
+SSE_MULTI_MAX_JOBS = int(os.getenv("SSE_MULTI_MAX_JOBS", "100"))
+JOB_INDEX_MAXLEN = int(os.getenv("JOB_INDEX_MAXLEN", "1000"))
+SSE_MAX_CONNECTIONS_PER_USER = int(os.getenv("SSE_MAX_CONNECTIONS_PER_USER", "10"))
+SSE_MAX_CONNECTIONS_PER_POD = int(os.getenv("SSE_MAX_CONNECTIONS_PER_POD", "1000"))
+SSE_CONNECTION_STALE_SECONDS = int(os.getenv("SSE_CONNECTION_STALE_SECONDS", "60"))
+WS_SEND_QUEUE_MAX = int(os.getenv("WS_SEND_QUEUE_MAX", "256"))
+
+# Job event stream retention
+JOB_EVENTS_IDLE_TTL = int(os.getenv("JOB_EVENTS_IDLE_TTL", "604800"))
+JOB_EVENTS_ORPHAN_GRACE = int(os.getenv("JOB_EVENTS_ORPHAN_GRACE", "3600"))
+JOB_EVENTS_JANITOR_INTERVAL = int(os.getenv("JOB_EVENTS_JANITOR_INTERVAL", "300"))
+JOB_EVENTS_JANITOR_SCAN_COUNT = int(os.getenv("JOB_EVENTS_JANITOR_SCAN_COUNT", "500"))
+REDIS_MEMORY_SAMPLE_KEYS = int(os.getenv("REDIS_MEMORY_SAMPLE_KEYS", "50"))
+REDIS_MEMORY_REPORT_TTL = float(os.getenv("REDIS_MEMORY_REPORT_TTL", "60"))
+
+# S3 configuration; blob storage reads its settings in app/db/storage.py
 S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY")
 S3_SECRET_KEY = os.getenv("S3_SECRET_KEY")
 
+# Shared secret for the /internal endpoints, sent as X-Internal-Token; the
+# endpoints are disabled while it is unset
+INTERNAL_METRICS_TOKEN = os.getenv("INTERNAL_METRICS_TOKEN")
+
 # API configuration
 API_TITLE = os.getenv("API_TITLE", "Olympis API")
 API_DEBUG = os.getenv("API_DEBUG", "False").lower() == "true"
 API_VERSION = os.getenv("API_VERSION", "1.0.0")
 API_ROOT_PATH = os.getenv("API_ROOT_PATH", "")
 
+# Pagination configuration
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "200"))
+
+# Logging configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+# Per-logger overrides, e.g. "app.db=DEBUG,app.stores.service=WARNING"
+LOG_LEVELS: Dict[str, str] = {
+    name.strip(): level.strip().upper()
+    for name, _, level in (
+        item.partition("=") for item in os.getenv("LOG_LEVELS", "").split(",")
+    )
+    if name.strip() and level.strip()
+}
+# Fraction of DEBUG records that are emitted
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+
 # CORS configuration
 CORS_ORIGINS: List[str] = [
     "http://localhost:5173",
@@ -1,4 +1,19 @@
-from typing import Optional, Protocol, runtime_checkable
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generic,
+    Mapping,
+    Optional,
+    Protocol,
+    TypeVar,
+    runtime_checkable,
+)
 
 import redis.asyncio as redis
 
@@ -10,6 +25,15 @@ logger = get_logger(__name__)
 
 # Protocol class since the redis client is redis specific
 # This allows for quick cache changes without changing code outside of this file
+class CachePipeline(Protocol):
+    # Commands are buffered and sent in a single round trip on execute()
+    def get(self, key: str) -> "CachePipeline": ...
+    def set(self, key: str, value: str, ex: int | None = None) -> "CachePipeline": ...
+    def delete(self, *keys: str) -> "CachePipeline": ...
+    def expire(self, key: str, time: int) -> "CachePipeline": ...
+    async def execute(self) -> list[Any]: ...
+
+
 @runtime_checkable
 class Cache(Protocol):
     async def get(self, key: str) -> Optional[str]: ...
@@ -17,9 +41,13 @@ class Cache(Protocol):
         self,
         key: str,
         value: str,
+        ttl: int | None = None,
     ) -> bool: ...
+    async def mget(self, *keys: str) -> list[Optional[str]]: ...
+    async def mset(self, mapping: Mapping[str, str], ttl: int | None = None) -> bool: ...
     async def delete(self, *keys: str) -> int: ...
     async def exists(self, *keys: str) -> int: ...
+    def pipeline(self, transaction: bool = False) -> CachePipeline: ...
     async def close(self) -> None: ...
 
 
@@ -29,49 +57,80 @@ class RedisCache:
         logger.info("RedisCache initialized")
 
     async def get(self, key: str) -> Optional[str]:
-        logger.info(f"Getting value for key: {key}")
+        logger.debug("Getting value for key: %s", key)
         try:
             value = await self._client.get(key)
-            logger.info(f"Successfully retrieved value for key: {key}")
+            logger.debug("Successfully retrieved value for key: %s", key)
             return value
         except Exception as e:
-            logger.exception(f"Error getting value for key: {key}")
+            logger.exception("Error getting value for key: %s", key)
             raise
 
     async def set(
         self,
         key: str,
         value: str,
+        ttl: int | None = None,
     ) -> bool:
-        logger.info(f"Setting value for key: {key}")
+        logger.debug("Setting value for key: %s", key)
         try:
-            result = await self._client.set(key, value)
-            logger.info(f"Successfully set value for key: {key}")
+            result = await self._client.set(key, value, ex=ttl)
+            logger.debug("Successfully set value for key: %s", key)
             return result
         except Exception as e:
-            logger.exception(f"Error setting value for key: {key}")
+            logger.exception("Error setting value for key: %s", key)
+            raise
+
+    async def mget(self, *keys: str) -> list[Optional[str]]:
+        logger.debug("Getting values for keys: %s", keys)
+        try:
+            values = await self._client.mget(keys)
+            logger.debug("Successfully retrieved values for %s keys", len(keys))
+            return values
+        except Exception:
+            logger.exception("Error getting values for keys: %s", keys)
+            raise
+
+    async def mset(self, mapping: Mapping[str, str], ttl: int | None = None) -> bool:
+        logger.debug("Setting values for keys: %s", list(mapping))
+        try:
+            if ttl is None:
+                result = await self._client.mset(mapping)
+            else:
+                # MSET cannot carry an expiry, so pipeline one SET EX per key
+                pipe = self._client.pipeline(transaction=False)
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=ttl)
+                result = all(await pipe.execute())
+            logger.debug("Successfully set values for %s keys", len(mapping))
+            return result
+        except Exception:
+            logger.exception("Error setting values for keys: %s", list(mapping))
             raise
 
     async def delete(self, *keys: str) -> int:
-        logger.info(f"Deleting keys: {keys}")
+        logger.debug("Deleting keys: %s", keys)
         try:
             result = await self._client.delete(*keys)
-            logger.info(f"Successfully deleted {result} keys")
+            logger.debug("Successfully deleted %s keys", result)
             return result
         except Exception as e:
-            logger.exception(f"Error deleting keys: {keys}")
+            logger.exception("Error deleting keys: %s", keys)
             raise
 
     async def exists(self, *keys: str) -> int:
-        logger.info(f"Checking existence of keys: {keys}")
+        logger.debug("Checking existence of keys: %s", keys)
         try:
             result = await self._client.exists(*keys)
-            logger.info(f"Found {result} existing keys")
+            logger.debug("Found %s existing keys", result)
             return result
         except Exception as e:
-            logger.exception(f"Error checking existence of keys: {keys}")
+            logger.exception("Error checking existence of keys: %s", keys)
             raise
 
+    def pipeline(self, transaction: bool = False) -> CachePipeline:
+        return self._client.pipeline(transaction=transaction)
+
     async def close(self) -> None:
         logger.info("Closing Redis connection")
         try:
@@ -82,8 +141,61 @@ class RedisCache:
             raise
 
 
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """In-process LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SingleFlight(Generic[V]):
+    """Coalesces concurrent calls for the same key into a single execution."""
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future[V]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[V]]) -> V:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller does not cancel the shared load
+        return await asyncio.shield(future)
+
+
 def init_cache() -> Cache:
-    logger.info(f"Initializing cache connection to {REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}")
+    logger.info(
+        "Initializing cache connection to %s:%s/%s", REDIS_HOST, REDIS_PORT, REDIS_DB
+    )
     try:
         client = redis.Redis.from_url(
             f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}", decode_responses=True
@@ -93,3 +205,14 @@ def init_cache() -> Cache:
     except Exception as e:
         logger.exception("Failed to initialize cache connection")
         raise
+
+
+# cache connection for the queue worker; every job runs its own event loop,
+# so the client cannot be shared between jobs
+@asynccontextmanager
+async def get_queue_cache() -> AsyncGenerator[Cache, None]:
+    cache = init_cache()
+    try:
+        yield cache
+    finally:
+        await cache.close()
@@ -1,33 +1,153 @@
 import asyncio
+import time
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import AsyncGenerator
 
 from pydantic_core import MultiHostUrl
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import (
+    API_DB_MAX_OVERFLOW,
+    API_DB_POOL_PRE_PING,
+    API_DB_POOL_RECYCLE,
+    API_DB_POOL_SIZE,
+    API_DB_POOL_TIMEOUT,
+    API_DB_STATEMENT_CACHE_SIZE,
     DB_ECHO,
     POSTGRES_DB,
     POSTGRES_PASSWORD,
     POSTGRES_PORT,
     POSTGRES_SERVER,
     POSTGRES_USER,
+    WORKER_DB_MAX_OVERFLOW,
+    WORKER_DB_POOL_PRE_PING,
+    WORKER_DB_POOL_RECYCLE,
+    WORKER_DB_POOL_SIZE,
+    WORKER_DB_POOL_TIMEOUT,
+    WORKER_DB_STATEMENT_CACHE_SIZE,
 )
 from app.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class PoolConfig:
+    pool_size: int
+    max_overflow: int
+    timeout: float
+    recycle: int
+    pre_ping: bool
+    statement_cache_size: int
+
+
+API_POOL_CONFIG = PoolConfig(
+    pool_size=API_DB_POOL_SIZE,
+    max_overflow=API_DB_MAX_OVERFLOW,
+    timeout=API_DB_POOL_TIMEOUT,
+    recycle=API_DB_POOL_RECYCLE,
+    pre_ping=API_DB_POOL_PRE_PING,
+    statement_cache_size=API_DB_STATEMENT_CACHE_SIZE,
+)
+
+WORKER_POOL_CONFIG = PoolConfig(
+    pool_size=WORKER_DB_POOL_SIZE,
+    max_overflow=WORKER_DB_MAX_OVERFLOW,
+    timeout=WORKER_DB_POOL_TIMEOUT,
+    recycle=WORKER_DB_POOL_RECYCLE,
+    pre_ping=WORKER_DB_POOL_PRE_PING,
+    statement_cache_size=WORKER_DB_STATEMENT_CACHE_SIZE,
+)
+
+
+@dataclass(slots=True)
+class PoolMetrics:
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    # Connections opened beyond pool_size
+    overflow_events: int = 0
+    timeouts: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_time_total += seconds
+        if seconds > self.wait_time_max:
+            self.wait_time_max = seconds
+
+
 @dataclass(slots=True)
 class Database:
     engine: AsyncEngine
     session_maker: async_sessionmaker[AsyncSession]
+    metrics: PoolMetrics = field(default_factory=PoolMetrics)
+
+    def pool_status(self) -> dict:
+        pool = self.engine.sync_engine.pool
+        checkouts = self.metrics.checkouts
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkouts": checkouts,
+            "connects": self.metrics.connects,
+            "overflow_events": self.metrics.overflow_events,
+            "timeouts": self.metrics.timeouts,
+            "wait_time_avg_ms": (
+                self.metrics.wait_time_total / checkouts * 1000 if checkouts else 0.0
+            ),
+            "wait_time_max_ms": self.metrics.wait_time_max * 1000,
+        }
+
+
+def _instrumented_pool_class(metrics: PoolMetrics) -> type[AsyncAdaptedQueuePool]:
+    # Bound as a class attribute so pools recreated on dispose keep reporting
+    # into the same metrics object.
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                metrics.timeouts += 1
+                raise
+            finally:
+                metrics.record_wait(time.perf_counter() - started)
+
+        def _inc_overflow(self):
+            # Called by _do_get before it opens a connection; past pool_size
+            # that connection is an overflow one
+            opened = super()._inc_overflow()
+            if opened and self._overflow > 0:
+                metrics.overflow_events += 1
+            return opened
+
+    return InstrumentedPool
+
+
+def _register_pool_events(engine: AsyncEngine, metrics: PoolMetrics) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
 
 
 def _build_db_uri() -> MultiHostUrl:
@@ -42,21 +162,41 @@ def _build_db_uri() -> MultiHostUrl:
     )
 
 
-def init_database() -> Database:
+def init_database(pool_config: PoolConfig = API_POOL_CONFIG) -> Database:
     logger.info("Initializing database connection")
     try:
         db_uri = str(_build_db_uri())
         logger.info(
-            f"Connecting to database at {POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+            "Connecting to database at %s:%s/%s with pool %s",
+            POSTGRES_SERVER,
+            POSTGRES_PORT,
+            POSTGRES_DB,
+            pool_config,
         )
 
-        engine = create_async_engine(db_uri, echo=DB_ECHO, future=True)
+        metrics = PoolMetrics()
+        engine = create_async_engine(
+            db_uri,
+            echo=DB_ECHO,
+            future=True,
+            poolclass=_instrumented_pool_class(metrics),
+            pool_size=pool_config.pool_size,
+            max_overflow=pool_config.max_overflow,
+            pool_timeout=pool_config.timeout,
+            pool_recycle=pool_config.recycle,
+            pool_pre_ping=pool_config.pre_ping,
+            connect_args={
+                "statement_cache_size": pool_config.statement_cache_size,
+                "prepared_statement_cache_size": pool_config.statement_cache_size,
+            },
+        )
+        _register_pool_events(engine, metrics)
         session_maker = async_sessionmaker(
             bind=engine, class_=AsyncSession, expire_on_commit=False
         )
 
         logger.info("Database connection established successfully")
-        return Database(engine=engine, session_maker=session_maker)
+        return Database(engine=engine, session_maker=session_maker, metrics=metrics)
     except Exception:
         logger.exception("Failed to initialize database connection")
         raise
@@ -73,7 +213,7 @@ async def get_queue_db_session_maker():
         async with _queue_lock:
             if _queue_db is None:
                 logger.info("Creating RQ worker database engine")
-                _queue_db = init_database()
+                _queue_db = init_database(WORKER_POOL_CONFIG)
     return _queue_db
 
 
@@ -82,9 +222,9 @@ async def get_queue_database_session() -> AsyncGenerator[AsyncSession, None]:
     try:
         database: Database = await get_queue_db_session_maker()
         async with database.session_maker() as async_session:
-            logger.info("Database session created successfully")
+            logger.debug("Database session created successfully")
             yield async_session
-            logger.info("Database session closed")
+            logger.debug("Database session closed")
     except Exception:
         logger.exception("Error managing database session")
         raise
@@ -1,16 +1,22 @@
+import hmac
 from typing import Annotated, Any, AsyncGenerator, Dict
 
 from fastapi import Depends, Request
+from starlette.requests import HTTPConnection
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import INTERNAL_METRICS_TOKEN
+from app.db.cache import Cache
 from app.db.database import Database
+from app.db.storage import BlobStore
+from app.exceptions import ResourceNotFoundError, UnauthorizedError
 from app.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-async def authenticate_request(request: Request) -> Dict[str, Any] | None:
-    logger.info(f"Authenticating request to {request.url.path}")
+async def authenticate_request(request: HTTPConnection) -> Dict[str, Any] | None:
+    logger.debug("Authenticating request to %s", request.url.path)
     return {
         "sub": "testuser",
     }
@@ -19,14 +25,23 @@ async def authenticate_request(request: Request) -> Dict[str, Any] | None:
 AuthDependency = Annotated[Dict[str, Any], Depends(authenticate_request)]
 
 
+async def require_internal_access(request: HTTPConnection) -> None:
+    """Allow only callers holding INTERNAL_METRICS_TOKEN."""
+    if not INTERNAL_METRICS_TOKEN:
+        raise ResourceNotFoundError("Not found")
+    token = request.headers.get("X-Internal-Token", "")
+    if not hmac.compare_digest(token.encode(), INTERNAL_METRICS_TOKEN.encode()):
+        raise UnauthorizedError("Invalid internal token")
+
+
 async def get_database_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
-    logger.info("Creating database session")
+    logger.debug("Creating database session")
     try:
         database: Database = request.app.state.app_state.database
         async with database.session_maker() as async_session:
-            logger.info("Database session created successfully")
+            logger.debug("Database session created successfully")
             yield async_session
-            logger.info("Database session closed")
+            logger.debug("Database session closed")
     except Exception:
         logger.exception("Error managing database session")
         raise
@@ -35,17 +50,15 @@ async def get_database_session(request: Request) -> AsyncGenerator[AsyncSession,
 DatabaseDependency = Annotated[AsyncSession, Depends(get_database_session)]
 
 
-async def get_storage_session():
-    logger.info("Getting storage session")
-    pass
+async def get_storage_session(request: HTTPConnection) -> BlobStore:
+    return request.app.state.app_state.storage
 
 
-# StorageDependency
+StorageDependency = Annotated[BlobStore, Depends(get_storage_session)]
 
 
-async def get_cache_session():
-    logger.info("Getting cache session")
-    pass
+async def get_cache_session(request: HTTPConnection) -> Cache:
+    return request.app.state.app_state.cache
 
 
-# CacheDependency
+CacheDependency = Annotated[Cache, Depends(get_cache_session)]
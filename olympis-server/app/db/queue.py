@@ -1,4 +1,5 @@
 import redis
+import redis.asyncio as aioredis
 from rq import Queue
 
 from app.config import REDIS_DB, REDIS_HOST, REDIS_PORT
@@ -9,7 +10,7 @@ logger = get_logger(__name__)
 
 def init_queue() -> Queue:
     logger.info(
-        f"Initializing queue connection to {REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
+        "Initializing queue connection to %s:%s/%s", REDIS_HOST, REDIS_PORT, REDIS_DB
     )
     try:
         client = redis.Redis.from_url(
@@ -21,3 +22,22 @@ def init_queue() -> Queue:
     except Exception:
         logger.exception("Failed to initialize queue connection")
         raise
+
+
+def init_queue_reader() -> aioredis.Redis:
+    """Non-blocking client for reading RQ job state from request handlers."""
+    logger.info(
+        "Initializing queue reader connection to %s:%s/%s",
+        REDIS_HOST,
+        REDIS_PORT,
+        REDIS_DB,
+    )
+    try:
+        client = aioredis.Redis.from_url(
+            f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}", decode_responses=True
+        )
+        logger.info("Queue reader connection established successfully")
+        return client
+    except Exception:
+        logger.exception("Failed to initialize queue reader connection")
+        raise
@@ -20,3 +20,8 @@ class ValidationError(BaseError):
 class UnauthorizedError(BaseError):
     status_code = 401
     code = "UNAUTHORIZED"
+
+
+class TooManyRequestsError(BaseError):
+    status_code = 429
+    code = "TOO_MANY_REQUESTS"
@@ -0,0 +1,172 @@
+import asyncio
+import time
+import uuid
+from collections import Counter
+
+import redis.asyncio as aioredis
+from starlette.requests import HTTPConnection, Request
+
+from app.config import (
+    SSE_CONNECTION_STALE_SECONDS,
+    SSE_KEEPALIVE_SECONDS,
+    SSE_MAX_CONNECTIONS_PER_POD,
+    SSE_MAX_CONNECTIONS_PER_USER,
+)
+from app.exceptions import TooManyRequestsError
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _user_connections_key(user_id: uuid.UUID) -> str:
+    return f"sse:connections:user:{user_id}"
+
+
+class SSEConnection:
+    """One admitted event stream; notices the client leaving without polling."""
+
+    def __init__(self, user_id: uuid.UUID):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.disconnected = asyncio.get_running_loop().create_future()
+        self._watcher: asyncio.Task | None = None
+
+    def watch(self, request: Request, on_disconnect) -> None:
+        async def listen() -> None:
+            while True:
+                message = await request.receive()
+                if message["type"] == "http.disconnect":
+                    break
+            if not self.disconnected.done():
+                self.disconnected.set_result(None)
+            await on_disconnect(self)
+
+        self._watcher = asyncio.create_task(listen())
+
+    async def wait(self, ready: asyncio.Event, timeout: float) -> bool:
+        """Wait until `ready` is set; False on timeout or disconnect."""
+        if ready.is_set():
+            return True
+        if self.disconnected.done():
+            return False
+
+        waiter = asyncio.ensure_future(ready.wait())
+        try:
+            await asyncio.wait(
+                {waiter, self.disconnected},
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            waiter.cancel()
+        return ready.is_set()
+
+    def stop_watching(self) -> None:
+        if self._watcher is not None and self._watcher is not asyncio.current_task():
+            self._watcher.cancel()
+
+
+class SSEConnectionManager:
+    """Admits event streams (SSE and WebSocket) within per-user and per-pod limits.
+
+    Per-pod limits are counted in memory. Per-user limits hold across pods in
+    a Redis sorted set of connection ids scored by their last heartbeat, so
+    connections of a pod that died stop counting once they go stale.
+    """
+
+    def __init__(self, client: aioredis.Redis):
+        self._client = client
+        self._connections: dict[str, SSEConnection] = {}
+        self._per_user: Counter[uuid.UUID] = Counter()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for connection in list(self._connections.values()):
+            await self.release(connection)
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self._connections),
+            "users": len(self._per_user),
+            "max_connections": SSE_MAX_CONNECTIONS_PER_POD,
+            "max_connections_per_user": SSE_MAX_CONNECTIONS_PER_USER,
+        }
+
+    async def admit(
+        self, request: HTTPConnection, user_id: uuid.UUID, watch: bool = True
+    ) -> SSEConnection:
+        """Admit a stream, or raise TooManyRequestsError.
+
+        WebSockets read their own receive channel, so they pass watch=False
+        and release the connection when the socket closes.
+        """
+        if len(self._connections) >= SSE_MAX_CONNECTIONS_PER_POD:
+            logger.warning("SSE pod connection limit reached")
+            raise TooManyRequestsError("Too many open event streams")
+
+        connection = SSEConnection(user_id)
+        key = _user_connections_key(user_id)
+        now = time.time()
+
+        pipe = self._client.pipeline(transaction=True)
+        pipe.zremrangebyscore(key, 0, now - SSE_CONNECTION_STALE_SECONDS)
+        pipe.zadd(key, {connection.id: now})
+        pipe.zcard(key)
+        pipe.expire(key, SSE_CONNECTION_STALE_SECONDS)
+        _, _, open_streams, _ = await pipe.execute()
+
+        if open_streams > SSE_MAX_CONNECTIONS_PER_USER:
+            await self._client.zrem(key, connection.id)
+            logger.warning("SSE user connection limit reached for %s", user_id)
+            raise TooManyRequestsError("Too many open event streams")
+
+        self._connections[connection.id] = connection
+        self._per_user[user_id] += 1
+        if watch:
+            connection.watch(request, self.release)
+        return connection
+
+    async def release(self, connection: SSEConnection) -> None:
+        """Forget a connection; safe to call from both the stream and its watcher."""
+        if self._connections.pop(connection.id, None) is None:
+            return
+        connection.stop_watching()
+        self._per_user[connection.user_id] -= 1
+        if self._per_user[connection.user_id] <= 0:
+            del self._per_user[connection.user_id]
+        try:
+            await self._client.zrem(
+                _user_connections_key(connection.user_id), connection.id
+            )
+        except Exception:
+            # The entry goes stale on its own
+            logger.exception("Failed to release SSE connection %s", connection.id)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(SSE_KEEPALIVE_SECONDS)
+            if not self._connections:
+                continue
+            now = time.time()
+            pipe = self._client.pipeline(transaction=False)
+            for connection in self._connections.values():
+                key = _user_connections_key(connection.user_id)
+                pipe.zadd(key, {connection.id: now}, xx=True)
+                pipe.expire(key, SSE_CONNECTION_STALE_SECONDS)
+            try:
+                await pipe.execute()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("SSE connection heartbeat failed")
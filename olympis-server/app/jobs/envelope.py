@@ -0,0 +1,79 @@
+"""Job event envelope shared by the server, crawler and agents workers.
+
+Every message on a `job:{id}:events` stream carries a `data` field holding
+the JSON envelope {"v", "type", "stage", "ts", "payload"} and a plain `type`
+field, so consumers can route events without decoding them. Producers
+validate and serialize the envelope once; consumers forward it as is.
+
+The copies in olympis-server/app/jobs/envelope.py, olympis-crawler/envelope.py
+and olympis-agents/agents/shared/envelope.py must stay identical.
+"""
+
+import os
+import time
+from typing import Any
+
+from pydantic_core import from_json, to_json
+
+ENVELOPE_VERSION = 1
+
+EVENT_TYPES = frozenset({"progress", "done", "failed"})
+TERMINAL_EVENT_TYPES = frozenset({"done", "failed"})
+EVENT_STAGES = frozenset({"crawl", "extract", "save"})
+
+JOB_EVENTS_MAXLEN = int(os.getenv("JOB_EVENTS_MAXLEN", "1000"))
+JOB_EVENTS_TTL = int(os.getenv("JOB_EVENTS_TTL", "86400"))
+
+
+def job_events_stream(events_id: Any) -> str:
+    return f"job:{events_id}:events"
+
+
+def encode_event(
+    event_type: str,
+    stage: str | None = None,
+    payload: dict[str, Any] | None = None,
+) -> bytes:
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown job event type: {event_type!r}")
+    if stage is not None and stage not in EVENT_STAGES:
+        raise ValueError(f"Unknown job event stage: {stage!r}")
+    if payload is not None and not isinstance(payload, dict):
+        raise ValueError("Job event payload must be a dict")
+
+    return to_json(
+        {
+            "v": ENVELOPE_VERSION,
+            "type": event_type,
+            "stage": stage,
+            "ts": time.time_ns() // 1_000_000,
+            "payload": payload or {},
+        }
+    )
+
+
+def decode_event(data: bytes | str) -> dict[str, Any]:
+    return from_json(data)
+
+
+def publish_event(
+    connection: Any,
+    events_id: Any,
+    event_type: str,
+    stage: str | None = None,
+    payload: dict[str, Any] | None = None,
+) -> None:
+    """Append an event to the job's stream; terminal events start its expiry."""
+    stream = job_events_stream(events_id)
+    data = encode_event(event_type, stage, payload)
+
+    pipe = connection.pipeline(transaction=False)
+    pipe.xadd(
+        stream,
+        {"type": event_type, "data": data},
+        maxlen=JOB_EVENTS_MAXLEN,
+        approximate=True,
+    )
+    if event_type in TERMINAL_EVENT_TYPES:
+        pipe.expire(stream, JOB_EVENTS_TTL)
+    pipe.execute()
@@ -0,0 +1,175 @@
+import asyncio
+import uuid
+from collections import deque
+from typing import Any
+
+import redis.asyncio as aioredis
+
+from app.config import SSE_READER_BLOCK_MS, SSE_READER_COUNT, SSE_SUBSCRIBER_BUFFER
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+StreamMessage = tuple[str, dict[str, Any]]
+
+
+def stream_id_key(msg_id: str) -> tuple[int, int]:
+    ms, _, seq = msg_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def parse_stream_id(value: str | None) -> str | None:
+    """Return `value` if it is a usable stream id, e.g. from Last-Event-ID."""
+    if not value:
+        return None
+    try:
+        ms, seq = stream_id_key(value.strip())
+    except ValueError:
+        return None
+    if ms < 0 or seq < 0:
+        return None
+    return f"{ms}-{seq}"
+
+
+class Subscription:
+    """Buffered messages of one stream newer than `after`, for one consumer.
+
+    Subscriptions created with the same `ready` event wake one consumer that
+    reads several streams.
+    """
+
+    def __init__(
+        self,
+        stream: str,
+        after: str,
+        maxlen: int,
+        ready: asyncio.Event | None = None,
+    ):
+        self.stream = stream
+        self.overflowed = False
+        # Cleared once a newer message arrives; stream ids only grow
+        self._after: tuple[int, int] | None = stream_id_key(after)
+        self._maxlen = maxlen
+        self._messages: deque[StreamMessage] = deque()
+        self._ready = ready if ready is not None else asyncio.Event()
+
+    def push(self, message: StreamMessage) -> None:
+        if self._after is not None:
+            # The shared reader may resume from a cursor older than `after`
+            if stream_id_key(message[0]) <= self._after:
+                return
+            self._after = None
+        if len(self._messages) >= self._maxlen:
+            # The consumer is too slow; it is closed and resumes on reconnect
+            self.overflowed = True
+        else:
+            self._messages.append(message)
+        self._ready.set()
+
+    def push_front(self, messages: list[StreamMessage]) -> None:
+        self._messages.extendleft(reversed(messages))
+        if messages:
+            self._ready.set()
+
+    def drain(self) -> list[StreamMessage]:
+        messages = list(self._messages)
+        self._messages.clear()
+        return messages
+
+
+class JobEventHub:
+    """Reads every watched job stream with one blocking XREAD per process.
+
+    A blocked XREAD pins a pooled connection, so instead of one read loop
+    per SSE client, a single background task reads all active streams and
+    fans the messages out to in-memory subscriptions.
+    """
+
+    def __init__(self, client: aioredis.Redis):
+        self._client = client
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self._cursors: dict[str, str] = {}
+        # Writing to the control stream wakes the reader when the watched
+        # streams change, without cancelling the blocked read.
+        self._control = f"sse:control:{uuid.uuid4().hex}"
+        self._control_cursor = "0-0"
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._client.delete(self._control)
+
+    @property
+    def watched_streams(self) -> int:
+        return len(self._cursors)
+
+    async def subscribe(
+        self, stream: str, after: str, ready: asyncio.Event | None = None
+    ) -> Subscription:
+        """Subscribe to messages newer than `after`, which the caller already has."""
+        subscription = Subscription(stream, after, SSE_SUBSCRIBER_BUFFER, ready)
+        self._subscriptions.setdefault(stream, set()).add(subscription)
+
+        cursor = self._cursors.get(stream)
+        if cursor is None:
+            self._cursors[stream] = after
+            await self._wake()
+        elif stream_id_key(cursor) > stream_id_key(after):
+            # The shared reader is already past this subscriber's position;
+            # everything it dispatches from here on is newer than the gap.
+            gap = await self._client.xrange(stream, min=f"({after}", max=cursor)
+            subscription.push_front(gap)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.stream)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.stream]
+            self._cursors.pop(subscription.stream, None)
+
+    async def _wake(self) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        pipe.xadd(self._control, {"wake": "1"}, maxlen=1)
+        pipe.expire(self._control, 86400)
+        await pipe.execute()
+
+    async def _run(self) -> None:
+        logger.info("Job event reader started: %s", self._control)
+        while True:
+            streams = {self._control: self._control_cursor, **self._cursors}
+            try:
+                results = await self._client.xread(
+                    streams, block=SSE_READER_BLOCK_MS, count=SSE_READER_COUNT
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job event reader failed, retrying")
+                await asyncio.sleep(1)
+                continue
+
+            for stream, messages in results or []:
+                if stream == self._control:
+                    self._control_cursor = messages[-1][0]
+                    continue
+                if stream not in self._cursors:
+                    continue
+                self._cursors[stream] = messages[-1][0]
+                for subscription in self._subscriptions.get(stream, ()):
+                    for message in messages:
+                        subscription.push(message)
+
@@ -0,0 +1,216 @@
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+
+import redis.asyncio as aioredis
+
+from app.config import (
+    JOB_EVENTS_IDLE_TTL,
+    JOB_EVENTS_JANITOR_INTERVAL,
+    JOB_EVENTS_JANITOR_SCAN_COUNT,
+    JOB_EVENTS_ORPHAN_GRACE,
+    REDIS_MEMORY_REPORT_TTL,
+    REDIS_MEMORY_SAMPLE_KEYS,
+)
+from app.logger import get_logger
+
+from .envelope import JOB_EVENTS_MAXLEN, JOB_EVENTS_TTL, encode_event
+from .events import stream_id_key
+from .service import get_pipeline_statuses
+
+logger = get_logger(__name__)
+
+EVENT_STREAM_PATTERN = "job:*:events"
+_JANITOR_LOCK = "jobs:events:janitor"
+
+
+def _job_id_from_stream(stream: str) -> str:
+    return stream[len("job:") : -len(":events")]
+
+
+async def _sweep_page(client: aioredis.Redis, streams: list[str]) -> int:
+    pipe = client.pipeline(transaction=False)
+    for stream in streams:
+        pipe.ttl(stream)
+        pipe.xrevrange(stream, count=1)
+    rows = await pipe.execute()
+
+    # Streams with a TTL already ended, or were swept before
+    candidates = {}
+    for index, stream in enumerate(streams):
+        ttl, latest = rows[2 * index], rows[2 * index + 1]
+        if ttl == -1 and latest:
+            candidates[stream] = stream_id_key(latest[0][0])[0] / 1000
+
+    if not candidates:
+        return 0
+
+    job_ids = [_job_id_from_stream(stream) for stream in candidates]
+    statuses = await get_pipeline_statuses(client, job_ids)
+
+    now = time.time()
+    pipe = client.pipeline(transaction=False)
+    expired = 0
+    for (stream, last_event_at), job in zip(candidates.items(), statuses):
+        idle = now - last_event_at
+        if job.status == "failed":
+            # Failed stages never write their terminal event themselves
+            event = encode_event("failed", job.current_stage)
+            pipe.xadd(
+                stream,
+                {"type": "failed", "data": event},
+                maxlen=JOB_EVENTS_MAXLEN,
+                approximate=True,
+            )
+        elif job.status in ("finished", "not_found"):
+            if idle < JOB_EVENTS_ORPHAN_GRACE:
+                continue
+        elif idle < JOB_EVENTS_IDLE_TTL:
+            continue
+        pipe.expire(stream, JOB_EVENTS_TTL)
+        expired += 1
+
+    if expired:
+        await pipe.execute()
+    return expired
+
+
+async def sweep_event_streams(client: aioredis.Redis) -> int:
+    """Set a TTL on event streams whose pipeline ended without a terminal event.
+
+    Covers failed pipelines, streams left behind after their RQ jobs expired
+    and pipelines that have been idle for longer than JOB_EVENTS_IDLE_TTL.
+    """
+    expired = 0
+    page: list[str] = []
+    async for stream in client.scan_iter(
+        match=EVENT_STREAM_PATTERN,
+        count=JOB_EVENTS_JANITOR_SCAN_COUNT,
+        _type="stream",
+    ):
+        page.append(stream)
+        if len(page) >= JOB_EVENTS_JANITOR_SCAN_COUNT:
+            expired += await _sweep_page(client, page)
+            page = []
+    if page:
+        expired += await _sweep_page(client, page)
+    return expired
+
+
+class EventStreamJanitor:
+    """Periodically sweeps job event streams; one API pod sweeps at a time."""
+
+    def __init__(self, client: aioredis.Redis):
+        self._client = client
+        self._token = uuid.uuid4().hex
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(JOB_EVENTS_JANITOR_INTERVAL)
+            try:
+                # The lock expires on its own, so a sweep runs at most once
+                # per interval across all pods
+                acquired = await self._client.set(
+                    _JANITOR_LOCK, self._token, nx=True, ex=JOB_EVENTS_JANITOR_INTERVAL
+                )
+                if not acquired:
+                    continue
+                started = time.perf_counter()
+                expired = await sweep_event_streams(self._client)
+                logger.info(
+                    "Event stream sweep expired %s streams in %.2fs",
+                    expired,
+                    time.perf_counter() - started,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event stream sweep failed")
+
+
+def key_family(key: str) -> str:
+    if key.startswith("job:") and key.endswith(":events"):
+        return "job:*:events"
+    prefix, _, rest = key.partition(":")
+    if prefix == "rq" and rest:
+        return f"rq:{rest.partition(':')[0]}:*"
+    return f"{prefix}:*" if rest else key
+
+
+async def redis_memory_report(client: aioredis.Redis) -> dict:
+    """Key counts and estimated memory per key family.
+
+    Every key is counted, but MEMORY USAGE is only sampled for the first
+    REDIS_MEMORY_SAMPLE_KEYS keys of each family and extrapolated.
+    """
+    counts: dict[str, int] = defaultdict(int)
+    samples: dict[str, list[str]] = defaultdict(list)
+    async for key in client.scan_iter(count=1000):
+        family = key_family(key)
+        counts[family] += 1
+        if len(samples[family]) < REDIS_MEMORY_SAMPLE_KEYS:
+            samples[family].append(key)
+
+    pipe = client.pipeline(transaction=False)
+    for keys in samples.values():
+        for key in keys:
+            pipe.memory_usage(key, samples=5)
+    usages = iter(await pipe.execute())
+
+    families = {}
+    for family, keys in samples.items():
+        sampled = [usage or 0 for _, usage in zip(keys, usages)]
+        average = sum(sampled) / len(sampled) if sampled else 0
+        families[family] = {
+            "keys": counts[family],
+            "sampled": len(sampled),
+            "estimated_bytes": int(average * counts[family]),
+        }
+
+    info = await client.info("memory")
+    return {
+        "used_memory": info.get("used_memory"),
+        "maxmemory": info.get("maxmemory"),
+        "maxmemory_policy": info.get("maxmemory_policy"),
+        "families": dict(
+            sorted(families.items(), key=lambda item: -item[1]["estimated_bytes"])
+        ),
+    }
+
+
+class RedisMemoryReport:
+    """redis_memory_report, computed at most once per REDIS_MEMORY_REPORT_TTL.
+
+    The report scans the whole keyspace of the shared broker, so concurrent
+    callers wait for one scan and later ones get the cached result.
+    """
+
+    def __init__(self, client: aioredis.Redis):
+        self._client = client
+        self._lock = asyncio.Lock()
+        self._report: dict | None = None
+        self._generated_at = 0.0
+
+    async def get(self) -> dict:
+        async with self._lock:
+            age = time.monotonic() - self._generated_at
+            if self._report is None or age >= REDIS_MEMORY_REPORT_TTL:
+                self._report = await redis_memory_report(self._client)
+                self._generated_at = time.monotonic()
+                age = 0.0
+            return {**self._report, "age_seconds": round(age, 1)}
@@ -1,105 +1,346 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import StreamingResponse
-from rq import Queue
 import asyncio
-import json
-import redis
-from rq.job import Job
+import uuid
+from typing import List, Literal
 
+from fastapi import APIRouter, Header, Query, Request, WebSocket
+from fastapi.responses import Response, StreamingResponse
+import redis.asyncio as redis
+
+from app.campaigns.service import get_active_campaign_job_ids
+from app.config import SSE_KEEPALIVE_SECONDS, SSE_MULTI_MAX_JOBS, SSE_REPLAY_MAX
+from app.exceptions import TooManyRequestsError
 from app.logger import get_logger
+from app.stores.service import get_active_setup_job_ids
 from app.user.dependencies import UserDependency
 
+from .envelope import TERMINAL_EVENT_TYPES, decode_event, job_events_stream
+from .connections import SSEConnectionManager
+from .events import JobEventHub, Subscription, parse_stream_id, stream_id_key
+from .schema import JobEventSnapshot, JobStatusResponse, PipelineStatus
+from .service import get_pipeline_statuses, store_jobs_stream, user_jobs_stream
+from .websocket import WS_CLOSE_TRY_AGAIN_LATER, JobEventSocket
+
 logger = get_logger(__name__)
 router = APIRouter()
 
+MAX_STATUS_IDS = 100
+_ENDED_STATUSES = ("finished", "failed", "not_found")
 
-@router.get("/{job_id}")
-async def read_job(job_id: str, request: Request, user: UserDependency):
-    logger.info(f"JOB READ {job_id} requested for user: {user.id}")
-    q = request.app.state.app_state.queue
 
-    job = Job.fetch(job_id, connection=q.connection)
+@router.get("/", response_model=JobStatusResponse)
+async def read_jobs(
+    request: Request,
+    user: UserDependency,
+    ids: List[str] = Query(..., min_length=1, max_length=MAX_STATUS_IDS),
+) -> JobStatusResponse:
+    logger.info("JOB READ %s jobs requested for user: %s", len(ids), user.id)
+    client = request.app.state.app_state.queue_reader
 
-    return {"status": job.get_status()}
+    jobs = await get_pipeline_statuses(client, list(dict.fromkeys(ids)))
+    return JobStatusResponse(jobs=jobs)
 
 
-@router.get("/{job_id}/events")
-async def read_job_events(job_id: str, request: Request, user: UserDependency):
-    r: redis.Redis = request.app.state.app_state.cache._client
+def _format_job_event(job_id: str, fields: dict) -> str | None:
+    data = fields.get("data")
+    if data is None:
+        return None
+    return f'data: {{"job_id":"{job_id}","event":{data}}}\n\n'
+
+
+@router.get("/events")
+async def read_active_job_events(
+    request: Request, user: UserDependency, store_id: uuid.UUID | None = None
+):
+    """Stream the events of many setup jobs over one connection.
+
+    Covers the setup jobs of the user's stores, or with `store_id` the setup
+    jobs of that store's campaigns. Each event is tagged with its job id;
+    jobs created while connected are picked up from the scope's job index
+    stream, and finished jobs are dropped. Every job starts with its latest
+    event, which is also what a reconnect gets.
+    """
+    app_state = request.app.state.app_state
+    r: redis.Redis = app_state.queue_reader
+    hub: JobEventHub = app_state.job_events
+    connections: SSEConnectionManager = app_state.sse_connections
+
+    if store_id is None:
+        index_stream = user_jobs_stream(user.id)
+    else:
+        index_stream = store_jobs_stream(store_id)
+
+    # The index position is read before the database, so a job created in
+    # between is announced after it rather than missed
+    latest = await r.xrevrange(index_stream, count=1)
+    index_after = latest[0][0] if latest else "0-0"
 
-    stream = f"job:{job_id}:events"
+    async with app_state.database.session_maker() as session:
+        if store_id is None:
+            job_ids = await get_active_setup_job_ids(
+                user.id, session, SSE_MULTI_MAX_JOBS
+            )
+        else:
+            job_ids = await get_active_campaign_job_ids(
+                user.id, store_id, session, SSE_MULTI_MAX_JOBS
+            )
+
+    connection = await connections.admit(request, user.id)
+    ready = asyncio.Event()
+    jobs: dict[str, Subscription] = {}
+
+    async def watch(new_job_ids: list[str]):
+        new_job_ids = [job_id for job_id in new_job_ids if job_id not in jobs]
+        free = SSE_MULTI_MAX_JOBS - len(jobs)
+        if len(new_job_ids) > free:
+            logger.warning(
+                "SSE job limit reached for %s, dropping %s jobs",
+                index_stream,
+                len(new_job_ids) - free,
+            )
+            new_job_ids = new_job_ids[:free]
+
+        pipe = r.pipeline(transaction=False)
+        for job_id in new_job_ids:
+            pipe.xrevrange(job_events_stream(job_id), count=1)
+        latest_events = await pipe.execute() if new_job_ids else []
+
+        events = []
+        for job_id, latest in zip(new_job_ids, latest_events):
+            after = "0-0"
+            if latest:
+                after, fields = latest[0]
+                event = _format_job_event(job_id, fields)
+                if event is not None:
+                    events.append(event)
+                if fields.get("type") in TERMINAL_EVENT_TYPES:
+                    continue
+            jobs[job_id] = await hub.subscribe(job_events_stream(job_id), after, ready)
+        return events
 
     async def gen():
+        try:
+            async for event in stream_events():
+                yield event
+        finally:
+            await connections.release(connection)
+
+    async def stream_events():
         yield "retry: 3000\n\n"
 
+        index = await hub.subscribe(index_stream, index_after, ready)
         try:
-            existing_messages = await r.xrange(stream)
-            logger.info(f"Sending {len(existing_messages)} existing messages for job {job_id}")
-
-            for msg_id, fields in existing_messages:
-                raw = None
-                if isinstance(fields, dict):
-                    raw = fields.get(b"data")
-                    if raw is None:
-                        raw = fields.get("data")
-                if raw is None:
+            for event in await watch([str(job_id) for job_id in job_ids]):
+                yield event
+
+            while True:
+                if not await connection.wait(ready, SSE_KEEPALIVE_SECONDS):
+                    if connection.disconnected.done():
+                        return
+                    yield ": keepalive\n\n"
                     continue
+                ready.clear()
 
-                if isinstance(raw, bytes):
-                    raw = raw.decode("utf-8", "replace")
+                announced = [fields["job_id"] for _, fields in index.drain()]
+                for event in await watch(announced):
+                    yield event
 
-                # Ensure it's valid JSON before sending
-                try:
-                    _ = json.loads(raw)
-                except Exception:
-                    logger.warning(f"SSE WARN: non-JSON 'data' value: {raw}")
-                    continue
+                for job_id, subscription in list(jobs.items()):
+                    if subscription.overflowed:
+                        # The client reconnects and starts from the latest events
+                        return
+                    for _, fields in subscription.drain():
+                        event = _format_job_event(job_id, fields)
+                        if event is not None:
+                            yield event
+                        if fields.get("type") in TERMINAL_EVENT_TYPES:
+                            hub.unsubscribe(jobs.pop(job_id))
+                            break
+                if index.overflowed:
+                    return
+        finally:
+            hub.unsubscribe(index)
+            for subscription in jobs.values():
+                hub.unsubscribe(subscription)
 
-                sid = msg_id.decode() if isinstance(msg_id, bytes) else msg_id
-                yield f"id: {sid}\n"
-                yield f"data: {raw}\n\n"
-
-            # Set current to the last message ID, or "$" if no messages exist
-            current = existing_messages[-1][0].decode() if existing_messages else "$"
-
-        except Exception as e:
-            logger.error(f"Error reading existing messages: {e}")
-            current = "$"
-
-        # Then continue streaming new messages
-        while True:
-            if await request.is_disconnected():
-                return
-
-            results = await r.xread({stream: current}, block=15000, count=10)
-            if not results:
-                yield ": keepalive\n\n"
-                continue
-
-            for _name, messages in results:
-                for msg_id, fields in messages:
-                    raw = None
-                    if isinstance(fields, dict):
-                        raw = fields.get(b"data")
-                        if raw is None:
-                            raw = fields.get("data")
-                    if raw is None:
-                        continue
+    return StreamingResponse(
+        gen(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Disable Nginx buffering
+        },
+    )
 
-                    if isinstance(raw, bytes):
-                        raw = raw.decode("utf-8", "replace")
 
-                    # Ensure it's valid JSON before sending
-                    try:
-                        _ = json.loads(raw)
-                    except Exception:
-                        logger.warning(f"SSE WARN: non-JSON 'data' value: {raw}")
-                        continue
+@router.get("/{job_id}", response_model=PipelineStatus)
+async def read_job(job_id: str, request: Request, user: UserDependency):
+    logger.info("JOB READ %s requested for user: %s", job_id, user.id)
+    client = request.app.state.app_state.queue_reader
+
+    (job,) = await get_pipeline_statuses(client, [job_id])
+    return job
+
+
+def _format_event(msg_id: str, fields: dict) -> str | None:
+    # Producers validate and serialize the envelope, so it is forwarded as is
+    data = fields.get("data")
+    if data is None:
+        return None
+    return f"id: {msg_id}\ndata: {data}\n\n"
+
 
-                    sid = msg_id.decode() if isinstance(msg_id, bytes) else msg_id
-                    yield f"id: {sid}\n"
-                    yield f"data: {raw}\n\n"
-                    current = sid
+async def _snapshot_event(
+    r: redis.Redis, job_id: str, stream: str
+) -> tuple[str, str | None, bool]:
+    """Current pipeline state and the latest event, in place of the history."""
+    pipe = r.pipeline(transaction=False)
+    pipe.xrevrange(stream, count=1)
+    pipe.xlen(stream)
+    latest, event_count = await pipe.execute()
+    (job,) = await get_pipeline_statuses(r, [job_id])
+
+    last_id, last_event = None, None
+    terminal = job.status in ("finished", "failed")
+    if latest:
+        last_id, fields = latest[0]
+        terminal = terminal or fields.get("type") in TERMINAL_EVENT_TYPES
+        try:
+            last_event = decode_event(fields["data"])
+        except (KeyError, ValueError):
+            logger.warning("SSE WARN: malformed event %s on %s", last_id, stream)
+
+    snapshot = JobEventSnapshot(
+        job=job, last_event=last_event, event_count=event_count
+    )
+    # Without any event yet the id still marks a reconnect as a resume, so a
+    # finished job is answered with 204 rather than another snapshot
+    event = (
+        f"id: {last_id or '0-0'}\nevent: snapshot\n"
+        f"data: {snapshot.model_dump_json()}\n\n"
+    )
+    return event, last_id, terminal
+
+
+async def _job_ended(r: redis.Redis, job_id: str, stream: str) -> bool:
+    """Whether the job has nothing left to stream.
+
+    True if its last event is terminal, or if its stream is gone (terminal
+    streams expire) and the pipeline is no longer running.
+    """
+    latest = await r.xrevrange(stream, count=1)
+    if latest:
+        return latest[0][1].get("type") in TERMINAL_EVENT_TYPES
+    (job,) = await get_pipeline_statuses(r, [job_id])
+    return job.status in _ENDED_STATUSES
+
+
+@router.get("/{job_id}/events")
+async def read_job_events(
+    job_id: str,
+    request: Request,
+    user: UserDependency,
+    replay: Literal["history", "snapshot"] = "history",
+    last_event_id_query: str | None = Query(None, alias="lastEventId"),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """Stream job events.
+
+    Reconnecting clients resume after `Last-Event-ID` (or `lastEventId` for
+    clients that cannot set headers). New clients get the last
+    SSE_REPLAY_MAX events, or with `replay=snapshot` a single `snapshot`
+    event with the current pipeline state. A client that fell further
+    behind than SSE_REPLAY_MAX also gets the snapshot. The stream ends
+    after the job's terminal event, and a reconnect to a job that has
+    ended gets 204 No Content.
+    """
+    app_state = request.app.state.app_state
+    r: redis.Redis = app_state.queue_reader
+    hub: JobEventHub = app_state.job_events
+    connections: SSEConnectionManager = app_state.sse_connections
+
+    stream = job_events_stream(job_id)
+    resume_after = parse_stream_id(last_event_id or last_event_id_query)
+
+    try:
+        if resume_after is not None:
+            messages = await r.xrange(
+                stream, min=f"({resume_after}", count=SSE_REPLAY_MAX + 1
+            )
+            send_snapshot = len(messages) > SSE_REPLAY_MAX
+        elif replay == "snapshot":
+            messages, send_snapshot = [], True
+        else:
+            messages = await r.xrevrange(stream, count=SSE_REPLAY_MAX)
+            messages.reverse()
+            send_snapshot = False
+    except Exception as e:
+        logger.error("Error reading existing messages: %s", e)
+        messages, send_snapshot = [], False
+
+    # EventSource reconnects after the stream closes on a terminal event;
+    # 204 is the answer that makes it stop
+    if not messages and not send_snapshot and await _job_ended(r, job_id, stream):
+        return Response(status_code=204)
+
+    connection = await connections.admit(request, user.id)
+
+    async def gen():
+        try:
+            async for event in stream_events():
+                yield event
+        finally:
+            await connections.release(connection)
+
+    async def stream_events():
+        yield "retry: 3000\n\n"
+
+        last_id = resume_after or "0-0"
+        finished = False
+        if send_snapshot:
+            event, snapshot_id, finished = await _snapshot_event(r, job_id, stream)
+            yield event
+            last_id = snapshot_id or last_id
+        else:
+            logger.info(
+                "Replaying %s messages for job %s after %s",
+                len(messages),
+                job_id,
+                resume_after,
+            )
+            for msg_id, fields in messages:
+                event = _format_event(msg_id, fields)
+                if event is not None:
+                    yield event
+                last_id = msg_id
+                finished = fields.get("type") in TERMINAL_EVENT_TYPES
+
+        if finished:
+            return
+
+        # Then continue streaming new messages from the shared reader
+        ready = asyncio.Event()
+        subscription = await hub.subscribe(stream, last_id, ready)
+        try:
+            while not subscription.overflowed:
+                if not await connection.wait(ready, SSE_KEEPALIVE_SECONDS):
+                    if connection.disconnected.done():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                ready.clear()
+
+                for msg_id, fields in subscription.drain():
+                    if stream_id_key(msg_id) <= stream_id_key(last_id):
+                        continue
+                    event = _format_event(msg_id, fields)
+                    if event is not None:
+                        yield event
+                    last_id = msg_id
+                    if fields.get("type") in TERMINAL_EVENT_TYPES:
+                        return
+        finally:
+            hub.unsubscribe(subscription)
 
     return StreamingResponse(
         gen(),
@@ -110,3 +351,28 @@ async def read_job_events(job_id: str, request: Request, user: UserDependency):
             "X-Accel-Buffering": "no",  # Disable Nginx buffering
         },
     )
+
+
+@router.websocket("/ws")
+async def job_events_socket(websocket: WebSocket, user: UserDependency):
+    """Job events of many jobs over one WebSocket.
+
+    Clients send {"action": "subscribe" | "unsubscribe", "job_ids": [...]}
+    and receive {"type": "event", "job_id", "id", "event"} messages.
+    Compression is negotiated as permessage-deflate by the server.
+    """
+    app_state = websocket.app.state.app_state
+    connections: SSEConnectionManager = app_state.sse_connections
+
+    try:
+        connection = await connections.admit(websocket, user.id, watch=False)
+    except TooManyRequestsError:
+        await websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER)
+        return
+
+    try:
+        await websocket.accept()
+        socket = JobEventSocket(websocket, app_state.job_events, app_state.queue_reader)
+        await socket.run()
+    finally:
+        await connections.release(connection)
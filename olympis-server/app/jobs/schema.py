@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Annotated, Any, Dict, List, Literal, Union
+
+from pydantic import BaseModel, Field
+
+from app.config import SSE_MULTI_MAX_JOBS
+
+
+class StageStatus(BaseModel):
+    stage: str
+    job_id: str
+    status: str | None
+    enqueued_at: datetime | None = None
+    started_at: datetime | None = None
+    ended_at: datetime | None = None
+    wait_ms: float | None = None
+    duration_ms: float | None = None
+
+
+class PipelineStatus(BaseModel):
+    job_id: str
+    status: str
+    current_stage: str | None
+    stages: List[StageStatus]
+
+
+class JobStatusResponse(BaseModel):
+    jobs: List[PipelineStatus]
+
+
+class JobEventSnapshot(BaseModel):
+    job: PipelineStatus
+    last_event: Any | None
+    event_count: int
+
+
+class SubscribeMessage(BaseModel):
+    action: Literal["subscribe"]
+    job_ids: List[str] = Field(min_length=1, max_length=SSE_MULTI_MAX_JOBS)
+    # Last event id already seen per job; those jobs resume instead of
+    # starting from their latest event
+    after: Dict[str, str] = Field(default_factory=dict)
+
+
+class UnsubscribeMessage(BaseModel):
+    action: Literal["unsubscribe"]
+    job_ids: List[str] = Field(min_length=1, max_length=SSE_MULTI_MAX_JOBS)
+
+
+SocketMessage = Annotated[
+    Union[SubscribeMessage, UnsubscribeMessage], Field(discriminator="action")
+]
@@ -1,18 +1,189 @@
-import json
 import uuid
+from datetime import datetime
+from typing import Any, Callable
 
-from rq import get_current_job
+import redis
+import redis.asyncio as aioredis
+from redis.client import Pipeline
+from rq import Queue, get_current_job
+from rq.job import Job as RQJob
+from rq.job import JobStatus
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import JOB_INDEX_MAXLEN
 from app.exceptions import BaseError, ResourceNotFoundError
+from app.jobs.envelope import JOB_EVENTS_TTL, publish_event
 from app.jobs.models import Job
+from app.jobs.schema import PipelineStatus, StageStatus
 from app.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def update_job_progress(event_dict: dict, events_id: uuid.UUID | None = None):
+# Setup pipeline stages, in execution order. The final stage keeps the setup
+# job id so its status is the status of the whole pipeline.
+SETUP_STAGES = ("crawl", "extract", "save")
+
+
+def stage_job_id(setup_job_id: uuid.UUID | str, stage: str) -> str:
+    if stage == SETUP_STAGES[-1]:
+        return str(setup_job_id)
+    return f"{setup_job_id}-{stage}"
+
+
+def enqueue_setup_pipeline(
+    connection: redis.Redis,
+    url: str,
+    setup_job_id: uuid.UUID,
+    save_func: Callable[..., Any],
+    save_args: tuple,
+    pipeline: Pipeline | None = None,
+) -> None:
+    """Submit the crawl -> extract -> save job graph in one MULTI/EXEC.
+
+    Pass a pipeline to batch several setups into the same transaction; the
+    caller is then responsible for executing it.
+    """
+    pipe = pipeline if pipeline is not None else connection.pipeline()
+
+    q_crawler = Queue("crawler", connection=connection)
+    q_agents = Queue("agents", connection=connection)
+    q = Queue("default", connection=connection)
+
+    job_crawl = q_crawler.create_job(
+        "crawler.get_cleaned_html",
+        args=(url, setup_job_id),
+        job_id=stage_job_id(setup_job_id, "crawl"),
+    )
+    job_agents = q_agents.create_job(
+        "agents.store_extractor.service.extract_store_data",
+        args=(None, setup_job_id),
+        job_id=stage_job_id(setup_job_id, "extract"),
+        depends_on=job_crawl,
+        status=JobStatus.DEFERRED,
+    )
+    job_save = q.create_job(
+        save_func,
+        args=save_args,
+        job_id=stage_job_id(setup_job_id, "save"),
+        depends_on=job_agents,
+        status=JobStatus.DEFERRED,
+    )
+
+    # Dependents are registered with plain writes: Queue.enqueue_job would
+    # read the parent job back from Redis, which is not there until EXEC.
+    q_crawler.enqueue_job(job_crawl, pipeline=pipe)
+    for job in (job_agents, job_save):
+        job.register_dependency(pipeline=pipe)
+        job.save(pipeline=pipe)
+
+    if pipeline is None:
+        pipe.execute()
+
+
+_RQ_JOB_FIELDS = ("status", "enqueued_at", "started_at", "ended_at")
+_FAILED_STATUSES = {"failed", "stopped", "canceled"}
+
+
+def _parse_rq_timestamp(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _elapsed_ms(start: datetime | None, end: datetime | None) -> float | None:
+    if start is None or end is None:
+        return None
+    return (end - start).total_seconds() * 1000
+
+
+def _aggregate_pipeline(setup_job_id: str, stages: list[StageStatus]) -> PipelineStatus:
+    for stage in stages:
+        if stage.status in _FAILED_STATUSES:
+            return PipelineStatus(
+                job_id=setup_job_id,
+                status="failed",
+                current_stage=stage.stage,
+                stages=stages,
+            )
+
+    if all(stage.status is None for stage in stages):
+        status, current_stage = "not_found", None
+    elif stages[-1].status == "finished":
+        status, current_stage = "finished", None
+    else:
+        current = next(stage for stage in stages if stage.status != "finished")
+        status, current_stage = current.status or "queued", current.stage
+
+    return PipelineStatus(
+        job_id=setup_job_id, status=status, current_stage=current_stage, stages=stages
+    )
+
+
+async def get_pipeline_statuses(
+    client: aioredis.Redis, setup_job_ids: list[str]
+) -> list[PipelineStatus]:
+    """Read the RQ state of every stage of every setup in one round trip."""
+    pipe = client.pipeline(transaction=False)
+    for setup_job_id in setup_job_ids:
+        for stage in SETUP_STAGES:
+            pipe.hmget(
+                RQJob.key_for(stage_job_id(setup_job_id, stage)), _RQ_JOB_FIELDS
+            )
+    rows = await pipe.execute()
+
+    statuses = []
+    for index, setup_job_id in enumerate(setup_job_ids):
+        stages = []
+        for offset, stage in enumerate(SETUP_STAGES):
+            status, enqueued, started, ended = rows[index * len(SETUP_STAGES) + offset]
+            enqueued_at = _parse_rq_timestamp(enqueued)
+            started_at = _parse_rq_timestamp(started)
+            ended_at = _parse_rq_timestamp(ended)
+            stages.append(
+                StageStatus(
+                    stage=stage,
+                    job_id=stage_job_id(setup_job_id, stage),
+                    status=status,
+                    enqueued_at=enqueued_at,
+                    started_at=started_at,
+                    ended_at=ended_at,
+                    wait_ms=_elapsed_ms(enqueued_at, started_at),
+                    duration_ms=_elapsed_ms(started_at, ended_at),
+                )
+            )
+        statuses.append(_aggregate_pipeline(setup_job_id, stages))
+    return statuses
+
+
+def user_jobs_stream(user_id: uuid.UUID | str) -> str:
+    return f"jobs:user:{user_id}"
+
+
+def store_jobs_stream(store_id: uuid.UUID | str) -> str:
+    return f"jobs:store:{store_id}"
+
+
+def announce_setup_job(
+    pipeline: Pipeline, index_stream: str, setup_job_id: uuid.UUID
+) -> None:
+    """Tell multi-job event streams watching `index_stream` about a new job."""
+    pipeline.xadd(
+        index_stream,
+        {"job_id": str(setup_job_id)},
+        maxlen=JOB_INDEX_MAXLEN,
+        approximate=True,
+    )
+    pipeline.expire(index_stream, JOB_EVENTS_TTL)
+
+
+def update_job_progress(
+    event_type: str,
+    stage: str | None = None,
+    payload: dict | None = None,
+    events_id: uuid.UUID | None = None,
+):
     job = get_current_job()
     if job is None:
         raise BaseError(message="No job found")
@@ -22,14 +193,11 @@ def update_job_progress(event_dict: dict, events_id: uuid.UUID | None = None):
     if events_id is None:
         events_id = job.id
 
-    r.xadd(
-        f"job:{events_id}:events",
-        {"data": json.dumps(event_dict, default=str)},
-    )
+    publish_event(r, events_id, event_type, stage, payload)
 
 
 async def delete_job(job_id: uuid.UUID, session: AsyncSession) -> None:
-    logger.info(f"Deleting job: {job_id}")
+    logger.info("Deleting job: %s", job_id)
 
     try:
         job_query = select(Job).where(Job.id == job_id)
@@ -37,19 +205,19 @@ async def delete_job(job_id: uuid.UUID, session: AsyncSession) -> None:
         job = job_result.scalar_one_or_none()
 
         if not job:
-            logger.warning(f"Job {job_id} not found")
+            logger.warning("Job %s not found", job_id)
             raise ResourceNotFoundError(f"Job {job_id} not found")
 
-        logger.info(f"Deleting job {job_id}")
+        logger.info("Deleting job %s", job_id)
         await session.delete(job)
 
         await session.commit()
-        logger.info(f"Job {job_id} deleted successfully")
+        logger.info("Job %s deleted successfully", job_id)
 
     except ResourceNotFoundError:
         await session.rollback()
         raise
     except Exception:
-        logger.exception(f"Error deleting job {job_id}")
+        logger.exception("Error deleting job %s", job_id)
         await session.rollback()
         raise
@@ -0,0 +1,241 @@
+import asyncio
+from collections import deque
+
+import redis.asyncio as aioredis
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+from pydantic_core import to_json
+
+from app.config import SSE_MULTI_MAX_JOBS, SSE_REPLAY_MAX, WS_SEND_QUEUE_MAX
+from app.logger import get_logger
+
+from .envelope import TERMINAL_EVENT_TYPES, job_events_stream
+from .events import JobEventHub, Subscription, parse_stream_id
+from .schema import SocketMessage, SubscribeMessage
+
+logger = get_logger(__name__)
+
+_socket_messages = TypeAdapter(SocketMessage)
+
+# Close code for a client that cannot keep up; it should reconnect later
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class SendQueue:
+    """Bounded outgoing messages of one socket.
+
+    Progress events only describe the latest state of a job, so a queued
+    progress event is replaced by a newer one of the same job, and the
+    oldest queued progress event is dropped when the queue is full. Other
+    events are never dropped; if the queue is full of them the client is
+    too slow and the queue reports an overflow.
+    """
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.overflowed = False
+        self.coalesced = 0
+        # Entries are [text, job_id]; a dropped entry's text becomes None
+        self._entries: deque[list] = deque()
+        self._progress: dict[str, list] = {}
+        self._size = 0
+        self._ready = asyncio.Event()
+
+    def put(self, text: str, progress_job_id: str | None = None) -> None:
+        if self.overflowed:
+            return
+        if progress_job_id is not None:
+            queued = self._progress.get(progress_job_id)
+            if queued is not None:
+                queued[0] = text
+                self.coalesced += 1
+                return
+
+        if self._size >= self.maxlen and not self._drop_oldest_progress():
+            self.overflow()
+            return
+
+        entry = [text, progress_job_id]
+        self._entries.append(entry)
+        self._size += 1
+        if progress_job_id is not None:
+            self._progress[progress_job_id] = entry
+        self._ready.set()
+
+    def overflow(self) -> None:
+        self.overflowed = True
+        self._ready.set()
+
+    def _drop_oldest_progress(self) -> bool:
+        if not self._progress:
+            return False
+        entry = self._progress.pop(next(iter(self._progress)))
+        entry[0] = None
+        self._size -= 1
+        self.coalesced += 1
+        return True
+
+    async def get(self) -> str | None:
+        """Next message to send, or None once the queue has overflowed."""
+        while True:
+            if self.overflowed:
+                return None
+            while self._entries:
+                entry = self._entries.popleft()
+                text, job_id = entry
+                if text is None:
+                    continue
+                self._size -= 1
+                if job_id is not None and self._progress.get(job_id) is entry:
+                    del self._progress[job_id]
+                return text
+            self._ready.clear()
+            await self._ready.wait()
+
+
+def _event_message(job_id: str, msg_id: str, data: str) -> str:
+    # The envelope is forwarded without being parsed; job ids come from the
+    # client and are escaped
+    return (
+        f'{{"type":"event","job_id":{_json(job_id)},"id":"{msg_id}","event":{data}}}'
+    )
+
+
+class JobEventSocket:
+    """Job event subscriptions of one WebSocket client.
+
+    Three tasks share the socket: the receive loop handles subscribe and
+    unsubscribe messages, the pump moves events from the shared reader into
+    the send queue, and the sender writes the queue to the socket at the
+    pace the client reads it.
+    """
+
+    def __init__(
+        self, websocket: WebSocket, hub: JobEventHub, client: aioredis.Redis
+    ):
+        self._websocket = websocket
+        self._hub = hub
+        self._client = client
+        self._jobs: dict[str, Subscription] = {}
+        self._ready = asyncio.Event()
+        self._queue = SendQueue(WS_SEND_QUEUE_MAX)
+
+    async def run(self) -> None:
+        sender = asyncio.create_task(self._send())
+        pump = asyncio.create_task(self._pump())
+        try:
+            while True:
+                raw = await self._websocket.receive_text()
+                try:
+                    message = _socket_messages.validate_json(raw)
+                except PydanticValidationError as e:
+                    self._queue.put(
+                        f'{{"type":"error","detail":{_json(str(e))}}}'
+                    )
+                    continue
+
+                if isinstance(message, SubscribeMessage):
+                    await self._subscribe(message.job_ids, message.after)
+                else:
+                    self._unsubscribe(message.job_ids)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            pump.cancel()
+            for subscription in self._jobs.values():
+                self._hub.unsubscribe(subscription)
+            self._jobs.clear()
+            logger.info(
+                "WebSocket closed, %s progress events coalesced",
+                self._queue.coalesced,
+            )
+
+    def _enqueue(self, job_id: str, msg_id: str, fields: dict) -> bool:
+        """Queue one event; True if it ends the job."""
+        data = fields.get("data")
+        event_type = fields.get("type")
+        if data is not None:
+            self._queue.put(
+                _event_message(job_id, msg_id, data),
+                job_id if event_type == "progress" else None,
+            )
+        return event_type in TERMINAL_EVENT_TYPES
+
+    async def _subscribe(self, job_ids: list[str], after: dict[str, str]) -> None:
+        new_job_ids = [
+            job_id for job_id in dict.fromkeys(job_ids) if job_id not in self._jobs
+        ]
+        free = SSE_MULTI_MAX_JOBS - len(self._jobs)
+        rejected = new_job_ids[free:]
+        new_job_ids = new_job_ids[:free]
+
+        # Resuming jobs replay what they missed, new ones start from their
+        # latest event, all in one round trip
+        pipe = self._client.pipeline(transaction=False)
+        for job_id in new_job_ids:
+            stream = job_events_stream(job_id)
+            resume_after = parse_stream_id(after.get(job_id))
+            if resume_after is not None:
+                pipe.xrange(stream, min=f"({resume_after}", count=SSE_REPLAY_MAX)
+            else:
+                pipe.xrevrange(stream, count=1)
+        replays = await pipe.execute() if new_job_ids else []
+
+        subscribed = []
+        for job_id, messages in zip(new_job_ids, replays):
+            last_id = parse_stream_id(after.get(job_id)) or "0-0"
+            finished = False
+            for msg_id, fields in messages:
+                finished = self._enqueue(job_id, msg_id, fields)
+                last_id = msg_id
+            if finished:
+                continue
+            self._jobs[job_id] = await self._hub.subscribe(
+                job_events_stream(job_id), last_id, self._ready
+            )
+            subscribed.append(job_id)
+
+        self._queue.put(
+            f'{{"type":"subscribed","job_ids":{_json(subscribed)},'
+            f'"rejected":{_json(rejected)}}}'
+        )
+
+    def _unsubscribe(self, job_ids: list[str]) -> None:
+        for job_id in job_ids:
+            subscription = self._jobs.pop(job_id, None)
+            if subscription is not None:
+                self._hub.unsubscribe(subscription)
+        self._queue.put(f'{{"type":"unsubscribed","job_ids":{_json(job_ids)}}}')
+
+    async def _pump(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            for job_id, subscription in list(self._jobs.items()):
+                if subscription.overflowed:
+                    self._queue.overflow()
+                for msg_id, fields in subscription.drain():
+                    if self._enqueue(job_id, msg_id, fields):
+                        self._hub.unsubscribe(self._jobs.pop(job_id))
+                        break
+            if self._queue.overflowed:
+                # The sender closes the socket
+                return
+
+    async def _send(self) -> None:
+        try:
+            while (text := await self._queue.get()) is not None:
+                await self._websocket.send_text(text)
+            logger.warning("WebSocket client too slow, closing")
+            await self._websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The receive loop sees the disconnect and cleans up
+            logger.debug("WebSocket send failed", exc_info=True)
+
+
+def _json(value) -> str:
+    return to_json(value).decode()
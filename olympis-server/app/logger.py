@@ -1,28 +1,144 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
 import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from app.config import LOG_DEBUG_SAMPLE_RATE, LOG_FORMAT, LOG_LEVEL, LOG_LEVELS
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = frozenset(
+    logging.makeLogRecord({}).__dict__.keys() | {"message", "asctime", "taskName"}
+)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Passes only a fraction of DEBUG records; other levels are never dropped."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class DeferredQueueHandler(QueueHandler):
+    # QueueHandler.prepare() formats the message on the calling thread. Only
+    # the traceback is rendered here, while its frames are still alive; the
+    # message itself is formatted by the listener thread.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_lock = threading.Lock()
+_configured = False
+_queue_handler: Optional[DeferredQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _build_output_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(
+            logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+            )
+        )
+    return handler
+
+
+def _start_listener() -> None:
+    global _queue_handler, _listener
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(
+        log_queue, _build_output_handler(), respect_handler_level=True
+    )
+    _listener.start()
+
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+    _queue_handler = DeferredQueueHandler(log_queue)
+    _queue_handler.addFilter(DebugSampler(LOG_DEBUG_SAMPLE_RATE))
+    root.addHandler(_queue_handler)
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+def _write_directly_after_fork() -> None:
+    # RQ runs every job in a forked work horse. The listener thread does not
+    # survive the fork, and the horse leaves through os._exit() without
+    # draining a queue, so the child writes synchronously instead.
+    global _queue_handler, _listener
+    if _queue_handler is None:
+        return
+
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    handler = _build_output_handler()
+    handler.addFilter(DebugSampler(LOG_DEBUG_SAMPLE_RATE))
+    root.addHandler(handler)
+    _queue_handler = None
+    _listener = None
+
+
+def configure_logging() -> None:
+    global _configured
+    with _lock:
+        if _configured:
+            return
+        _configured = True
+
+        logging.getLogger().setLevel(LOG_LEVEL)
+        for name, level in LOG_LEVELS.items():
+            logging.getLogger(name).setLevel(level)
+
+        _start_listener()
+        atexit.register(_stop_listener)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_write_directly_after_fork)
+
+
 # Create a custom logger
 def get_logger(name: Optional[str] = None) -> logging.Logger:
-    """Get a configured logger instance."""
-    logger = logging.getLogger(name or __name__)
-    
-    # Only configure if no handlers exist (avoid duplicate handlers)
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        
-        # Create console handler with formatting
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        logger.addHandler(handler)
-    
-    return logger
+    """Get a logger that writes through the shared background listener."""
+    configure_logging()
+    return logging.getLogger(name or __name__)
@@ -1,10 +1,11 @@
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+import redis.asyncio as aioredis
 from rq import Queue
 
 from app.campaigns.router import router as campaigns_router
@@ -21,8 +22,13 @@ from app.config import (
 )
 from app.db.cache import Cache, init_cache
 from app.db.database import Database, init_database
-from app.db.queue import init_queue
+from app.db.dependencies import require_internal_access
+from app.db.queue import init_queue, init_queue_reader
+from app.db.storage import BlobStore, init_storage
 from app.exceptions import BaseError
+from app.jobs.connections import SSEConnectionManager
+from app.jobs.events import JobEventHub
+from app.jobs.retention import EventStreamJanitor, RedisMemoryReport
 from app.logger import get_logger
 from app.stores.router import router as stores_router
 from app.user.router import router as user_router
@@ -36,7 +42,12 @@ class AppState:
     cache: Cache
     database: Database
     queue: Queue
-    # storage: Any
+    queue_reader: aioredis.Redis
+    job_events: JobEventHub
+    event_janitor: EventStreamJanitor
+    redis_report: RedisMemoryReport
+    sse_connections: SSEConnectionManager
+    storage: BlobStore
 
 
 async def init_app_state() -> AppState:
@@ -49,10 +60,30 @@ async def init_app_state() -> AppState:
         logger.info("Database initialized successfully")
 
         queue = init_queue()
+        queue_reader = init_queue_reader()
         logger.info("Queue initialized successfully")
 
-        # storage = await init_storage()
-        return AppState(cache=cache, database=database, queue=queue)
+        job_events = JobEventHub(queue_reader)
+        job_events.start()
+        event_janitor = EventStreamJanitor(queue_reader)
+        event_janitor.start()
+        sse_connections = SSEConnectionManager(queue_reader)
+        sse_connections.start()
+
+        storage = init_storage()
+        logger.info("Storage initialized successfully")
+
+        return AppState(
+            cache=cache,
+            database=database,
+            queue=queue,
+            queue_reader=queue_reader,
+            job_events=job_events,
+            event_janitor=event_janitor,
+            redis_report=RedisMemoryReport(queue_reader),
+            sse_connections=sse_connections,
+            storage=storage,
+        )
     except Exception as e:
         logger.exception("Failed to initialize application state")
         raise
@@ -72,7 +103,10 @@ async def on_startup(app: FastAPI):
 async def on_shutdown(app: FastAPI):
     logger.info("Starting application shutdown sequence")
     try:
-        # Add any cleanup logic here
+        app_state: AppState = app.state.app_state
+        await app_state.sse_connections.stop()
+        await app_state.job_events.stop()
+        await app_state.event_janitor.stop()
         logger.info("Application shutdown completed successfully")
     except Exception as e:
         logger.exception("Error during application shutdown")
@@ -106,18 +140,53 @@ app.add_middleware(
 
 app.include_router(user_router, prefix="/user")
 app.include_router(stores_router, prefix="/stores")
+app.include_router(jobs_router, prefix="/jobs")
 
-logger.info(f"Application initialized with title: {API_TITLE}, version: {API_VERSION}")
+logger.info(
+    "Application initialized with title: %s, version: %s", API_TITLE, API_VERSION
+)
 
 
 @app.exception_handler(BaseError)
 async def app_exception_handler(request: Request, exc: BaseError):
-    logger.exception(f"Application error occurred: {exc.code} - {exc.message}")
+    logger.exception("Application error occurred: %s - %s", exc.code, exc.message)
     body = {"detail": exc.message, "code": exc.code}
     return JSONResponse(status_code=exc.status_code, content=body)
 
 
 @app.get("/healthcheck")
 async def healthcheck() -> bool:
-    logger.info("Health check requested")
+    logger.debug("Health check requested")
     return True
+
+
+@app.get(
+    "/internal/metrics/db",
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_access)],
+)
+async def database_metrics(request: Request) -> dict:
+    database: Database = request.app.state.app_state.database
+    return database.pool_status()
+
+
+@app.get(
+    "/internal/metrics/redis",
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_access)],
+)
+async def redis_metrics(request: Request) -> dict:
+    return await request.app.state.app_state.redis_report.get()
+
+
+@app.get(
+    "/internal/metrics/sse",
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_access)],
+)
+async def sse_metrics(request: Request) -> dict:
+    app_state: AppState = request.app.state.app_state
+    return {
+        **app_state.sse_connections.stats(),
+        "watched_streams": app_state.job_events.watched_streams,
+    }
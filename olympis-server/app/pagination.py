@@ -0,0 +1,25 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+
+from app.exceptions import ValidationError
+
+
+# Keyset cursors are opaque to clients: the (created_at, id) pair of the last
+# row on a page, so the next page can continue with a plain index range scan.
+def encode_cursor(created_at: datetime | str, row_id: uuid.UUID | str) -> str:
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = f"{created_at}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError("Invalid pagination cursor")
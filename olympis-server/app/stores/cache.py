@@ -0,0 +1,112 @@
+import uuid
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+from pydantic import BaseModel
+
+from app.config import STORE_CACHE_TTL
+from app.db.cache import Cache, SingleFlight
+from app.logger import get_logger
+
+from .schema import StoreDataResponse, StoresResponse
+
+logger = get_logger(__name__)
+
+R = TypeVar("R", bound=BaseModel)
+
+# Responses are keyed on version tokens instead of being deleted on write, so
+# invalidating a user or a store is a single SET no matter how many pages or
+# dashboard views were cached for it.
+_VERSION_TTL = STORE_CACHE_TTL * 4
+
+_loads: SingleFlight[BaseModel] = SingleFlight()
+
+
+def _user_version_key(user_id: uuid.UUID) -> str:
+    return f"stores:version:user:{user_id}"
+
+
+def _store_version_key(store_id: uuid.UUID) -> str:
+    return f"stores:version:store:{store_id}"
+
+
+async def _read_through(
+    cache: Cache,
+    key: str,
+    model: type[R],
+    loader: Callable[[], Awaitable[R]],
+) -> R:
+    try:
+        raw = await cache.get(key)
+    except Exception:
+        logger.warning("Store cache unavailable, loading from database: %s", key)
+        return await loader()
+
+    if raw is not None:
+        return model.model_validate_json(raw)
+
+    async def load() -> R:
+        response = await loader()
+        try:
+            await cache.set(key, response.model_dump_json(), ttl=STORE_CACHE_TTL)
+        except Exception:
+            logger.warning("Failed to write store cache entry: %s", key)
+        return response
+
+    return await _loads.do(key, load)
+
+
+async def get_cached_stores(
+    cache: Cache,
+    user_id: uuid.UUID,
+    cursor: str | None,
+    limit: int,
+    loader: Callable[[], Awaitable[StoresResponse]],
+) -> StoresResponse:
+    try:
+        (user_version,) = await cache.mget(_user_version_key(user_id))
+    except Exception:
+        logger.warning("Store cache unavailable, loading stores for user: %s", user_id)
+        return await loader()
+
+    key = f"stores:list:{user_id}:{user_version or 0}:{cursor or ''}:{limit}"
+    return await _read_through(cache, key, StoresResponse, loader)
+
+
+async def get_cached_store_data(
+    cache: Cache,
+    user_id: uuid.UUID,
+    store_id: uuid.UUID,
+    cursor: str | None,
+    limit: int,
+    loader: Callable[[], Awaitable[StoreDataResponse]],
+) -> StoreDataResponse:
+    try:
+        user_version, store_version = await cache.mget(
+            _user_version_key(user_id), _store_version_key(store_id)
+        )
+    except Exception:
+        logger.warning("Store cache unavailable, loading store data: %s", store_id)
+        return await loader()
+
+    key = (
+        f"stores:data:{user_id}:{store_id}:{user_version or 0}:{store_version or 0}"
+        f":{cursor or ''}:{limit}"
+    )
+    return await _read_through(cache, key, StoreDataResponse, loader)
+
+
+async def invalidate_store_cache(
+    cache: Cache,
+    user_ids: Iterable[uuid.UUID] = (),
+    store_ids: Iterable[uuid.UUID] = (),
+) -> None:
+    pipe = cache.pipeline()
+    for user_id in user_ids:
+        pipe.set(_user_version_key(user_id), uuid.uuid4().hex, ex=_VERSION_TTL)
+    for store_id in store_ids:
+        pipe.set(_store_version_key(store_id), uuid.uuid4().hex, ex=_VERSION_TTL)
+
+    try:
+        await pipe.execute()
+    except Exception:
+        logger.exception("Failed to invalidate store cache")
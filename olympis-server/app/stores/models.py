@@ -36,24 +36,31 @@ class Store(Base, TimestampMixin):
         default=StoreState.setup,
     )
 
-    job_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("jobs.id"))
+    job_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("jobs.id", ondelete="SET NULL")
+    )
     job: Mapped[Job | None] = relationship(cascade="save-update, delete")
 
+    # Child rows are removed by ON DELETE CASCADE in the database
     users: Mapped[List["AssociationUserStore"]] = relationship(
-        back_populates="store", cascade="delete"
+        back_populates="store", cascade="delete", passive_deletes=True
     )
 
     campaigns: Mapped[List["Campaign"]] = relationship(
-        back_populates="store", cascade="delete"
+        back_populates="store", cascade="delete", passive_deletes=True
     )
 
-    store_meta: Mapped["StoreMetaData"] = relationship(cascade="delete")
+    store_meta: Mapped["StoreMetaData"] = relationship(
+        cascade="delete", passive_deletes=True
+    )
 
 
 class StoreMetaData(Base, TimestampMixin):
     __tablename__ = "stores_metadata"
 
     store_id: Mapped[uuid.UUID] = mapped_column(
-        PG_UUID(as_uuid=True), ForeignKey("stores.id"), primary_key=True
+        PG_UUID(as_uuid=True),
+        ForeignKey("stores.id", ondelete="CASCADE"),
+        primary_key=True,
     )
     data: Mapped[dict[str, Any]] = mapped_column(JSONB)
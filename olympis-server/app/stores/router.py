@@ -1,19 +1,32 @@
 import uuid
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request
 from rq import Queue
 
-from app.db.dependencies import DatabaseDependency
+from app.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from app.db.dependencies import CacheDependency, DatabaseDependency
 from app.logger import get_logger
-from app.stores.jobs import get_store_metadata
+from app.jobs.service import announce_setup_job, user_jobs_stream
+from app.stores.jobs import enqueue_store_setup
+from app.stores.cache import get_cached_store_data, get_cached_stores
 from app.user.dependencies import UserDependency
 
 from .schema import (
+    BatchCreateStoreRequest,
+    BatchCreateStoreResponse,
     CreateStoreRequest,
     CreateStoreResponse,
+    StoreDataResponse,
     StoresResponse,
 )
-from .service import create_store, delete_all_stores, delete_store, get_stores_db
+from .service import (
+    create_store,
+    create_stores_batch,
+    delete_all_stores,
+    delete_store,
+    get_store_data_for_user,
+    get_stores_db,
+)
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -21,53 +34,123 @@ router = APIRouter()
 
 @router.get("/", response_model=StoresResponse)
 async def get_stores(
-    user: UserDependency, session: DatabaseDependency
+    user: UserDependency,
+    session: DatabaseDependency,
+    cache: CacheDependency,
+    cursor: str | None = None,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
 ) -> StoresResponse:
-    logger.info(f"Stores requested for user: {user.id}")
+    logger.info("Stores requested for user: %s", user.id)
+
+    async def load() -> StoresResponse:
+        stores, next_cursor = await get_stores_db(user.id, session, cursor, limit)
+        return StoresResponse(stores=stores, nextCursor=next_cursor)
+
     try:
-        stores = await get_stores_db(user.id, session)
-        logger.info(f"Stores retrieved successfully for user: {user.id}")
-        return StoresResponse(stores=stores)
+        response = await get_cached_stores(cache, user.id, cursor, limit, load)
+        logger.info("Stores retrieved successfully for user: %s", user.id)
+        return response
     except Exception:
-        logger.exception(f"Error getting stores for user: {user.id}")
+        logger.exception("Error getting stores for user: %s", user.id)
         raise
 
 
+@router.get("/{store_id}", response_model=StoreDataResponse)
+async def get_store_data(
+    store_id: uuid.UUID,
+    user: UserDependency,
+    session: DatabaseDependency,
+    cache: CacheDependency,
+    cursor: str | None = None,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+) -> StoreDataResponse:
+    logger.info("Store data requested for store: %s by user: %s", store_id, user.id)
+    return await get_cached_store_data(
+        cache,
+        user.id,
+        store_id,
+        cursor,
+        limit,
+        lambda: get_store_data_for_user(user.id, store_id, session, cursor, limit),
+    )
+
+
 @router.post("/", response_model=CreateStoreResponse)
 async def create_new_store(
     request: Request,
     store_data: CreateStoreRequest,
     user: UserDependency,
     session: DatabaseDependency,
+    cache: CacheDependency,
 ) -> CreateStoreResponse:
     logger.info(
-        f"Store creation requested by user: {user.id}, store name: {store_data.name}"
+        "Store creation requested by user: %s, store name: %s", user.id, store_data.name
     )
 
-    store = await create_store(user.id, store_data, session)
+    store = await create_store(user.id, store_data, session, cache)
 
     # TODO change https addition
     q: Queue = request.app.state.app_state.queue
-    q.enqueue(
-        get_store_metadata,
+    pipe = q.connection.pipeline()
+    enqueue_store_setup(
+        q.connection,
         "https://" + store_data.url,
         store.id,
         store.setup_job_id,
-        job_id=str(store.setup_job_id),
+        pipeline=pipe,
     )
+    announce_setup_job(pipe, user_jobs_stream(user.id), store.setup_job_id)
+    pipe.execute()
 
-    logger.info(f"Queued metadata job {store.setup_job_id} for store {store.id}")
+    logger.info("Queued setup pipeline %s for store %s", store.setup_job_id, store.id)
 
     return store
 
 
+@router.post("/batch", response_model=BatchCreateStoreResponse)
+async def create_new_stores_batch(
+    request: Request,
+    batch: BatchCreateStoreRequest,
+    user: UserDependency,
+    session: DatabaseDependency,
+    cache: CacheDependency,
+) -> BatchCreateStoreResponse:
+    logger.info(
+        "Batch store creation requested by user: %s, items: %s",
+        user.id,
+        len(batch.stores),
+    )
+
+    results = await create_stores_batch(user.id, batch.stores, session, cache)
+    created = [result.store for result in results if result.store is not None]
+
+    # TODO change https addition
+    q: Queue = request.app.state.app_state.queue
+    pipe = q.connection.pipeline()
+    for store in created:
+        enqueue_store_setup(
+            q.connection,
+            "https://" + store.url,
+            store.id,
+            store.setup_job_id,
+            pipeline=pipe,
+        )
+        announce_setup_job(pipe, user_jobs_stream(user.id), store.setup_job_id)
+    pipe.execute()
+
+    logger.info("Queued %s setup pipelines for user %s", len(created), user.id)
+
+    return BatchCreateStoreResponse(results=results)
+
+
 @router.delete("/")
 async def delete_all_stores_endpoint(
     user: UserDependency,
     session: DatabaseDependency,
+    cache: CacheDependency,
 ) -> dict:
-    logger.info(f"Request to delete all stores for user: {user.id}")
-    await delete_all_stores(user.id, session)
+    logger.info("Request to delete all stores for user: %s", user.id)
+    await delete_all_stores(user.id, session, cache)
     return {"message": "All stores deleted successfully"}
 
 
@@ -76,15 +159,16 @@ async def delete_store_endpoint(
     store_id: str,
     user: UserDependency,
     session: DatabaseDependency,
+    cache: CacheDependency,
 ) -> dict:
-    logger.info(f"Store deletion requested by user: {user.id}, store_id: {store_id}")
+    logger.info("Store deletion requested by user: %s, store_id: %s", user.id, store_id)
 
     try:
         store_uuid = uuid.UUID(store_id)
     except ValueError:
-        logger.warning(f"Invalid store_id format: {store_id}")
+        logger.warning("Invalid store_id format: %s", store_id)
         raise ValueError("Invalid store ID format")
 
-    await delete_store(user.id, store_uuid, session)
+    await delete_store(user.id, store_uuid, session, cache)
 
     return {"message": "Store deleted successfully", "store_id": store_id}
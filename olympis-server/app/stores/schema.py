@@ -1,9 +1,10 @@
 import uuid
 from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.campaigns.schema import CampaignSummary
+from app.config import STORE_BATCH_MAX_ITEMS
 from app.stores.models import StoreState
 
 
@@ -19,6 +20,22 @@ class CreateStoreResponse(BaseModel):
     setup_job_id: uuid.UUID
 
 
+class BatchCreateStoreRequest(BaseModel):
+    stores: List[CreateStoreRequest] = Field(
+        ..., min_length=1, max_length=STORE_BATCH_MAX_ITEMS
+    )
+
+
+class BatchCreateStoreResult(BaseModel):
+    index: int
+    store: CreateStoreResponse | None = None
+    error: str | None = None
+
+
+class BatchCreateStoreResponse(BaseModel):
+    results: List[BatchCreateStoreResult]
+
+
 class StoreSummary(BaseModel):
     id: uuid.UUID
     name: str
@@ -31,7 +48,9 @@ class StoreDataResponse(BaseModel):
     currentStore: StoreSummary
     stores: List[StoreSummary]
     campaigns: List[CampaignSummary]
+    nextCursor: str | None = None
 
 
 class StoresResponse(BaseModel):
     stores: List[StoreSummary]
+    nextCursor: str | None = None
@@ -1,17 +1,24 @@
 import uuid
 
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import JSON, delete, func, insert, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.campaigns.models import Campaign
+from app.config import PAGE_SIZE_DEFAULT
+from app.db.cache import Cache
 from app.exceptions import ResourceNotFoundError, UnauthorizedError
 from app.jobs.models import Job
 from app.logger import get_logger
+from app.pagination import decode_cursor, encode_cursor
+from app.stores.cache import invalidate_store_cache
 from app.stores.models import Store, StoreMetaData, StoreState
 from app.user.models import AssociationUserStore, StoreRole
 
 from .schema import (
+    BatchCreateStoreResult,
     CampaignSummary,
     CreateStoreRequest,
     CreateStoreResponse,
@@ -21,100 +28,280 @@ from .schema import (
 
 logger = get_logger(__name__)
 
+_store_summaries = TypeAdapter(list[StoreSummary])
+_campaign_summaries = TypeAdapter(list[CampaignSummary])
+
+
+def _store_summary_object():
+    return func.json_build_object(
+        "id",
+        Store.id,
+        "name",
+        Store.name,
+        "url",
+        Store.url,
+        "status",
+        Store.status,
+        "job_id",
+        Store.job_id,
+    )
+
 
-async def get_stores_db(user_id: uuid.UUID, session: AsyncSession) -> list[StoreSummary]:
-    logger.info(f"Getting all stores for user: {user_id}")
+async def get_stores_db(
+    user_id: uuid.UUID,
+    session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = PAGE_SIZE_DEFAULT,
+) -> tuple[list[StoreSummary], str | None]:
+    logger.info("Getting stores for user: %s", user_id)
 
     try:
         stores_query = (
-            select(AssociationUserStore)
+            select(
+                Store.id,
+                Store.name,
+                Store.url,
+                Store.status,
+                Store.job_id,
+                AssociationUserStore.created_at,
+            )
+            .join(AssociationUserStore, AssociationUserStore.store_id == Store.id)
             .where(AssociationUserStore.user_id == user_id)
-            .options(selectinload(AssociationUserStore.store))
+            .order_by(AssociationUserStore.created_at, AssociationUserStore.store_id)
+            .limit(limit + 1)
         )
-        stores_result = await session.execute(stores_query)
-        store_associations = stores_result.scalars().all()
-
-        store_summaries = []
-        for assoc in store_associations:
-            store: Store = assoc.store
-            store_summaries.append(
-                StoreSummary(
-                    id=store.id,
-                    name=store.name,
-                    url=store.url,
-                    status=store.status,
-                    job_id=store.job_id,
-                )
+        if cursor is not None:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            stores_query = stores_query.where(
+                tuple_(AssociationUserStore.created_at, AssociationUserStore.store_id)
+                > tuple_(cursor_created_at, cursor_id)
             )
+        stores_result = await session.execute(stores_query)
+        rows = stores_result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        store_summaries = _store_summaries.validate_python(rows, from_attributes=True)
 
-        logger.info(f"Found {len(store_summaries)} stores for user: {user_id}")
-        return store_summaries
+        logger.info("Found %s stores for user: %s", len(store_summaries), user_id)
+        return store_summaries, next_cursor
 
     except Exception:
-        logger.exception(f"Error getting stores for user: {user_id}")
+        logger.exception("Error getting stores for user: %s", user_id)
         raise
 
 
 async def get_store_data_for_user(
-    user_id: uuid.UUID, store_id: uuid.UUID, session: AsyncSession
+    user_id: uuid.UUID,
+    store_id: uuid.UUID,
+    session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = PAGE_SIZE_DEFAULT,
 ) -> StoreDataResponse:
-    logger.info(f"Getting store data for user: {user_id}, store: {store_id}")
+    logger.info("Getting store data for user: %s, store: %s", user_id, store_id)
 
     try:
-        stores = await get_stores_db(user_id, session)
-        if not stores:
-            logger.warning(f"User {user_id} has no stores")
-            raise ResourceNotFoundError("No stores found for user")
-
-        selected_store = next((store for store in stores if store.id == store_id), None)
-        if selected_store is None:
-            logger.warning(
-                f"Store {store_id} not found or not accessible for user {user_id}"
+        # The outer row is the membership check and the selected store; the
+        # store list and the campaign page are aggregated into JSON columns so
+        # the whole dashboard is a single round trip.
+        current = aliased(Store, name="current_store")
+        membership = aliased(AssociationUserStore, name="membership")
+
+        stores_json = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            _store_summary_object(),
+                            AssociationUserStore.created_at,
+                            AssociationUserStore.store_id,
+                        )
+                    ),
+                    literal_column("'[]'::json"),
+                    type_=JSON,
+                )
             )
-            raise ResourceNotFoundError("Store not found")
+            .select_from(AssociationUserStore)
+            .join(Store, Store.id == AssociationUserStore.store_id)
+            .where(AssociationUserStore.user_id == user_id)
+            .scalar_subquery()
+        )
 
-        logger.info(f"Fetching campaigns for store: {store_id}")
-        campaigns_query = (
-            select(Campaign)
+        campaigns_page = (
+            select(Campaign.id, Campaign.name, Campaign.created_at)
             .where(Campaign.store_id == store_id)
-            .order_by(Campaign.created_at.desc())
+            .order_by(Campaign.created_at.desc(), Campaign.id.desc())
+            .limit(limit + 1)
         )
-        campaigns_result = await session.execute(campaigns_query)
-        campaigns = campaigns_result.scalars().all()
+        if cursor is not None:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            campaigns_page = campaigns_page.where(
+                tuple_(Campaign.created_at, Campaign.id)
+                < tuple_(cursor_created_at, cursor_id)
+            )
+        campaigns_page = campaigns_page.subquery("campaign_page")
+
+        campaigns_json = select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "id",
+                            campaigns_page.c.id,
+                            "name",
+                            campaigns_page.c.name,
+                            "created_at",
+                            campaigns_page.c.created_at,
+                        ),
+                        campaigns_page.c.created_at.desc(),
+                        campaigns_page.c.id.desc(),
+                    )
+                ),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            )
+        ).scalar_subquery()
+
+        dashboard_query = (
+            select(
+                current.id,
+                current.name,
+                current.url,
+                current.status,
+                current.job_id,
+                stores_json.label("stores"),
+                campaigns_json.label("campaigns"),
+            )
+            .join(membership, membership.store_id == current.id)
+            .where(membership.user_id == user_id, current.id == store_id)
+        )
+        dashboard_result = await session.execute(dashboard_query)
+        row = dashboard_result.one_or_none()
 
-        campaign_summaries = [
-            CampaignSummary(
-                id=campaign.id,
-                name=campaign.name,
+        if row is None:
+            logger.warning(
+                "Store %s not found or not accessible for user %s", store_id, user_id
             )
-            for campaign in campaigns
-        ]
+            raise ResourceNotFoundError("Store not found")
+
+        campaigns = row.campaigns
+        next_cursor = None
+        if len(campaigns) > limit:
+            campaigns = campaigns[:limit]
+            last = campaigns[-1]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
 
-        logger.info(f"Store data prepared successfully for user: {user_id}")
+        logger.info("Store data prepared successfully for user: %s", user_id)
         return StoreDataResponse(
-            currentStore=selected_store,
-            stores=stores,
-            campaigns=campaign_summaries,
+            currentStore=StoreSummary(
+                id=row.id,
+                name=row.name,
+                url=row.url,
+                status=row.status,
+                job_id=row.job_id,
+            ),
+            stores=_store_summaries.validate_python(row.stores),
+            campaigns=_campaign_summaries.validate_python(campaigns),
+            nextCursor=next_cursor,
         )
     except Exception:
         logger.exception(
-            f"Error getting store data for user: {user_id}, store: {store_id}"
+            "Error getting store data for user: %s, store: %s", user_id, store_id
         )
         raise
 
 
+async def get_active_setup_job_ids(
+    user_id: uuid.UUID, session: AsyncSession, limit: int
+) -> list[uuid.UUID]:
+    """Setup jobs of the user's stores that are still being set up, newest first."""
+    query = (
+        select(Store.job_id)
+        .join(AssociationUserStore, AssociationUserStore.store_id == Store.id)
+        .where(
+            AssociationUserStore.user_id == user_id,
+            Store.status == StoreState.setup,
+            Store.job_id.is_not(None),
+        )
+        .order_by(AssociationUserStore.created_at.desc())
+        .limit(limit)
+    )
+    result = await session.execute(query)
+    return list(result.scalars())
+
+
+async def _delete_stores(
+    store_ids: list[uuid.UUID], session: AsyncSession
+) -> list[uuid.UUID]:
+    """Delete stores and everything hanging off them in a single statement.
+
+    Campaigns, metadata and memberships go through ON DELETE CASCADE; the
+    setup jobs referenced by the stores and their campaigns are deleted in
+    the same statement. Returns the users that were members of the stores.
+    """
+    campaign_jobs = (
+        select(Campaign.job_id)
+        .where(Campaign.store_id.in_(store_ids), Campaign.job_id.is_not(None))
+        .cte("campaign_jobs")
+    )
+    deleted_memberships = (
+        delete(AssociationUserStore)
+        .where(AssociationUserStore.store_id.in_(store_ids))
+        .returning(AssociationUserStore.user_id)
+        .cte("deleted_memberships")
+    )
+    deleted_stores = (
+        delete(Store)
+        .where(Store.id.in_(store_ids))
+        .returning(Store.job_id)
+        .cte("deleted_stores")
+    )
+    deleted_jobs = (
+        delete(Job)
+        .where(
+            Job.id.in_(
+                select(deleted_stores.c.job_id).union(select(campaign_jobs.c.job_id))
+            )
+        )
+        .returning(Job.id)
+        .cte("deleted_jobs")
+    )
+
+    result = await session.execute(
+        select(deleted_memberships.c.user_id).distinct().add_cte(deleted_jobs)
+    )
+    return list(result.scalars().all())
+
+
+async def _store_user_ids(
+    store_ids: list[uuid.UUID], session: AsyncSession
+) -> list[uuid.UUID]:
+    result = await session.execute(
+        select(AssociationUserStore.user_id)
+        .where(AssociationUserStore.store_id.in_(store_ids))
+        .distinct()
+    )
+    return list(result.scalars().all())
+
+
 async def create_store(
-    user_id: uuid.UUID, store_data: CreateStoreRequest, session: AsyncSession
+    user_id: uuid.UUID,
+    store_data: CreateStoreRequest,
+    session: AsyncSession,
+    cache: Cache,
 ) -> CreateStoreResponse:
     logger.info(
-        f"Creating new store for user: {user_id}, store name: {store_data.name}"
+        "Creating new store for user: %s, store name: %s", user_id, store_data.name
     )
 
     try:
         setup_job = Job()
         session.add(setup_job)
         await session.flush()
-        logger.info(f"Job created with id: {setup_job.id}")
+        logger.info("Job created with id: %s", setup_job.id)
 
         new_store = Store(
             name=store_data.name,
@@ -125,17 +312,19 @@ async def create_store(
         session.add(new_store)
         await session.flush()
         logger.info(
-            f"Store created with id: {new_store.id}, linked to job: {setup_job.id}"
+            "Store created with id: %s, linked to job: %s", new_store.id, setup_job.id
         )
 
         user_store_association = AssociationUserStore(
             user_id=user_id, store_id=new_store.id, role=StoreRole.owner
         )
         session.add(user_store_association)
-        logger.info(f"User {user_id} associated as owner of store {new_store.id}")
+        logger.info("User %s associated as owner of store %s", user_id, new_store.id)
 
         await session.commit()
-        logger.info(f"Store {new_store.id} created successfully for user {user_id}")
+        logger.info("Store %s created successfully for user %s", new_store.id, user_id)
+
+        await invalidate_store_cache(cache, user_ids=[user_id])
 
         # Return the created store as StoreSummary and the job ID
         return CreateStoreResponse(
@@ -145,93 +334,178 @@ async def create_store(
             setup_job_id=setup_job.id,
         )
     except Exception:
-        logger.exception(f"Error creating store for user: {user_id}")
+        logger.exception("Error creating store for user: %s", user_id)
+        await session.rollback()
+        raise
+
+
+def _validate_store_request(
+    store_data: CreateStoreRequest, seen_urls: set[str]
+) -> tuple[str, str, str | None]:
+    """The stripped name and URL of a batch item, and an error if invalid."""
+    name = store_data.name.strip()
+    url = store_data.url.strip()
+    if not name or len(name) > 255:
+        return name, url, "Store name must be between 1 and 255 characters"
+    if not url or len(url) > 2048:
+        return name, url, "Store URL must be between 1 and 2048 characters"
+    if url.lower() in seen_urls:
+        return name, url, f"Duplicate store URL in batch: {url}"
+    seen_urls.add(url.lower())
+    return name, url, None
+
+
+async def create_stores_batch(
+    user_id: uuid.UUID,
+    stores_data: list[CreateStoreRequest],
+    session: AsyncSession,
+    cache: Cache,
+) -> list[BatchCreateStoreResult]:
+    logger.info("Creating %s stores for user: %s", len(stores_data), user_id)
+
+    results: list[BatchCreateStoreResult] = []
+    job_rows: list[dict] = []
+    store_rows: list[dict] = []
+    association_rows: list[dict] = []
+    seen_urls: set[str] = set()
+
+    for index, store_data in enumerate(stores_data):
+        name, url, error = _validate_store_request(store_data, seen_urls)
+        if error is not None:
+            logger.warning(
+                "Rejected batch item %s for user %s: %s", index, user_id, error
+            )
+            results.append(BatchCreateStoreResult(index=index, error=error))
+            continue
+
+        # Keys are generated up front so every table is a single multi-row
+        # INSERT without flushing between them
+        job_id = uuid.uuid4()
+        store_id = uuid.uuid4()
+        job_rows.append({"id": job_id})
+        store_rows.append(
+            {
+                "id": store_id,
+                "name": name,
+                "url": url,
+                "status": StoreState.setup,
+                "job_id": job_id,
+            }
+        )
+        association_rows.append(
+            {"user_id": user_id, "store_id": store_id, "role": StoreRole.owner}
+        )
+        results.append(
+            BatchCreateStoreResult(
+                index=index,
+                store=CreateStoreResponse(
+                    id=store_id,
+                    name=name,
+                    url=url,
+                    setup_job_id=job_id,
+                ),
+            )
+        )
+
+    if not store_rows:
+        return results
+
+    try:
+        await session.execute(insert(Job).values(job_rows))
+        await session.execute(insert(Store).values(store_rows))
+        await session.execute(insert(AssociationUserStore).values(association_rows))
+        await session.commit()
+        logger.info("Created %s stores for user %s", len(store_rows), user_id)
+    except Exception:
+        logger.exception("Error creating store batch for user: %s", user_id)
         await session.rollback()
         raise
 
+    await invalidate_store_cache(cache, user_ids=[user_id])
+    return results
+
 
 async def delete_store(
-    user_id: uuid.UUID, store_id: uuid.UUID, session: AsyncSession
+    user_id: uuid.UUID, store_id: uuid.UUID, session: AsyncSession, cache: Cache
 ) -> None:
-    logger.info(f"Deleting store {store_id} for user: {user_id}")
+    logger.info("Deleting store %s for user: %s", store_id, user_id)
 
     try:
         # Check if the store exists and user has permission
-        association_query = select(AssociationUserStore).where(
+        role_query = select(AssociationUserStore.role).where(
             AssociationUserStore.user_id == user_id,
             AssociationUserStore.store_id == store_id,
         )
-        association_result = await session.execute(association_query)
-        association = association_result.scalar_one_or_none()
+        role_result = await session.execute(role_query)
+        role = role_result.scalar_one_or_none()
 
-        if not association:
-            logger.warning(f"User {user_id} does not have access to store {store_id}")
+        if role is None:
+            logger.warning(
+                "User %s does not have access to store %s", user_id, store_id
+            )
             raise ResourceNotFoundError(f"Store {store_id} not found")
 
-        if association.role != StoreRole.owner:
-            logger.warning(f"User {user_id} is not owner of store {store_id}")
+        if role != StoreRole.owner:
+            logger.warning("User %s is not owner of store %s", user_id, store_id)
             raise UnauthorizedError("Only store owners can delete stores")
 
-        # Get the store object
-        store_query = select(Store).where(Store.id == store_id)
-        store_result = await session.execute(store_query)
-        store = store_result.scalar_one_or_none()
-
-        if not store:
-            logger.warning(f"Store {store_id} not found")
-            raise ResourceNotFoundError(f"Store {store_id} not found")
-
-        # Delete the store using ORM (this will trigger cascades)
-        logger.info(f"Deleting store {store_id}")
-        await session.delete(store)
+        logger.info("Deleting store %s", store_id)
+        affected_user_ids = await _delete_stores([store_id], session)
 
         await session.commit()
-        logger.info(f"Store {store_id} deleted successfully by user {user_id}")
+        logger.info("Store %s deleted successfully by user %s", store_id, user_id)
+
+        await invalidate_store_cache(
+            cache, user_ids=affected_user_ids, store_ids=[store_id]
+        )
 
     except (ResourceNotFoundError, UnauthorizedError):
         await session.rollback()
         raise
     except Exception:
-        logger.exception(f"Error deleting store {store_id} for user {user_id}")
+        logger.exception("Error deleting store %s for user %s", store_id, user_id)
         await session.rollback()
         raise
 
 
-async def delete_all_stores(user_id: uuid.UUID, session: AsyncSession) -> None:
-    logger.info(f"Deleting all stores for user: {user_id}")
+async def delete_all_stores(
+    user_id: uuid.UUID, session: AsyncSession, cache: Cache
+) -> None:
+    logger.info("Deleting all stores for user: %s", user_id)
     try:
         # Find all stores where user is owner
-        query = (
-            select(Store)
-            .join(AssociationUserStore)
-            .where(
-                AssociationUserStore.user_id == user_id,
-                AssociationUserStore.role == StoreRole.owner,
-            )
+        query = select(AssociationUserStore.store_id).where(
+            AssociationUserStore.user_id == user_id,
+            AssociationUserStore.role == StoreRole.owner,
         )
         result = await session.execute(query)
-        stores = result.scalars().all()
+        store_ids = list(result.scalars().all())
 
-        if not stores:
-            logger.info(f"No stores found to delete for user {user_id}")
+        if not store_ids:
+            logger.info("No stores found to delete for user %s", user_id)
             return
 
-        for store in stores:
-            logger.info(f"Deleting store {store.id}")
-            await session.delete(store)
+        logger.info("Deleting %s stores", len(store_ids))
+        affected_user_ids = await _delete_stores(store_ids, session)
 
         await session.commit()
-        logger.info(f"All stores deleted for user {user_id}")
+        logger.info("All stores deleted for user %s", user_id)
+
+        await invalidate_store_cache(
+            cache, user_ids=affected_user_ids, store_ids=store_ids
+        )
 
     except Exception:
-        logger.exception(f"Error deleting all stores for user: {user_id}")
+        logger.exception("Error deleting all stores for user: %s", user_id)
         await session.rollback()
         raise
 
 
-async def complete_store_setup(store_id: uuid.UUID, extracted_data: dict, session: AsyncSession) -> None:
-    logger.info(f"Completing setup for store: {store_id}")
-    logger.info(f"Extracted data to save {extracted_data}")
+async def complete_store_setup(
+    store_id: uuid.UUID, extracted_data: dict, session: AsyncSession, cache: Cache
+) -> None:
+    logger.info("Completing setup for store: %s", store_id)
+    logger.debug("Extracted data to save: %s keys", len(extracted_data or {}))
 
     try:
         store_query = select(Store).where(Store.id == store_id).options(selectinload(Store.store_meta))
@@ -239,30 +513,36 @@ async def complete_store_setup(store_id: uuid.UUID, extracted_data: dict, sessio
         store = store_result.scalar_one_or_none()
 
         if not store:
-            logger.warning(f"Store {store_id} not found")
+            logger.warning("Store %s not found", store_id)
             raise ResourceNotFoundError(f"Store {store_id} not found")
 
-        logger.info(f"Setting store {store_id} status to active")
+        logger.info("Setting store %s status to active", store_id)
         store.status = StoreState.active
         store.job_id = None
 
         if store.store_meta:
-            logger.info(f"Updating existing metadata for store {store_id}")
+            logger.info("Updating existing metadata for store %s", store_id)
             store.store_meta.data = extracted_data
         else:
-            logger.info(f"Creating new metadata for store {store_id}")
+            logger.info("Creating new metadata for store %s", store_id)
             store_metadata = StoreMetaData(store_id=store_id, data=extracted_data)
             session.add(store_metadata)
             store.store_meta = store_metadata
 
 
+        affected_user_ids = await _store_user_ids([store_id], session)
+
         await session.commit()
-        logger.info(f"Store setup completed successfully for store {store_id}")
+        logger.info("Store setup completed successfully for store %s", store_id)
+
+        await invalidate_store_cache(
+            cache, user_ids=affected_user_ids, store_ids=[store_id]
+        )
 
     except ResourceNotFoundError:
         await session.rollback()
         raise
     except Exception:
-        logger.exception(f"Error completing store setup for store {store_id}")
+        logger.exception("Error completing store setup for store %s", store_id)
         await session.rollback()
         raise
@@ -0,0 +1,61 @@
+from typing import Optional
+
+from app.config import (
+    USER_CACHE_LOCAL_MAX_ENTRIES,
+    USER_CACHE_LOCAL_TTL,
+    USER_CACHE_TTL,
+)
+from app.db.cache import Cache, TTLCache
+from app.logger import get_logger
+from app.user.schema import GetUser
+
+logger = get_logger(__name__)
+
+# First tier: per-process LRU. Entries in other pods cannot be invalidated
+# directly, so the short TTL bounds how long they may outlive a deletion.
+_local_users: TTLCache[GetUser] = TTLCache(
+    max_entries=USER_CACHE_LOCAL_MAX_ENTRIES, ttl=USER_CACHE_LOCAL_TTL
+)
+
+
+def _user_key(external_id: str) -> str:
+    return f"user:ext:{external_id}"
+
+
+async def get_cached_user(cache: Cache, external_id: str) -> Optional[GetUser]:
+    key = _user_key(external_id)
+
+    user = _local_users.get(key)
+    if user is not None:
+        return user
+
+    try:
+        raw = await cache.get(key)
+    except Exception:
+        logger.warning("User cache unavailable, falling back to database: %s", key)
+        return None
+
+    if raw is None:
+        return None
+
+    user = GetUser.model_validate_json(raw)
+    _local_users.set(key, user)
+    return user
+
+
+async def set_cached_user(cache: Cache, user: GetUser) -> None:
+    key = _user_key(user.external_id)
+    _local_users.set(key, user)
+    try:
+        await cache.set(key, user.model_dump_json(), ttl=USER_CACHE_TTL)
+    except Exception:
+        logger.warning("Failed to write user cache entry: %s", key)
+
+
+async def invalidate_cached_user(cache: Cache, external_id: str) -> None:
+    key = _user_key(external_id)
+    _local_users.delete(key)
+    try:
+        await cache.delete(key)
+    except Exception:
+        logger.warning("Failed to invalidate user cache entry: %s", key)
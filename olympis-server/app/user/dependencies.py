@@ -1,9 +1,12 @@
 from typing import Annotated
 
 from fastapi import Depends
+from starlette.requests import HTTPConnection
 
-from app.db.dependencies import AuthDependency, DatabaseDependency
+from app.db.database import Database
+from app.db.dependencies import AuthDependency, CacheDependency
 from app.logger import get_logger
+from app.user.cache import get_cached_user, invalidate_cached_user, set_cached_user
 from app.user.schema import GetUser
 from app.user.service import create_user_db, get_user_db
 
@@ -11,24 +14,34 @@ logger = get_logger(__name__)
 
 
 async def get_user_dp(
+    request: HTTPConnection,
     auth_payload: AuthDependency,
-    session: DatabaseDependency,
+    cache: CacheDependency,
 ):
-    logger.info(f"Getting user dependency for auth payload: {auth_payload.get('sub')}")
+    external_id = auth_payload.get("sub")
+    logger.debug("Getting user dependency for auth payload: %s", external_id)
 
-    try:
-        user = await get_user_db(auth_payload, session)
-        logger.info(f"User dependency resolved: {user.id}")
-        return user
-    except Exception:
-        await session.rollback()
-
-        clerk_id = "testuser"
-        email = "testuser@gmail.com"
-        await create_user_db(clerk_id, email, session)
-        user = await get_user_db(auth_payload, session)
-        logger.info(f"User dependency resolved: {user.id}")
+    user = await get_cached_user(cache, external_id)
+    if user is not None:
         return user
 
+    # Only a cache miss opens a session, so cached requests never touch the pool
+    database: Database = request.app.state.app_state.database
+    async with database.session_maker() as session:
+        try:
+            user = await get_user_db(auth_payload, session)
+        except Exception:
+            await session.rollback()
+
+            clerk_id = "testuser"
+            email = "testuser@gmail.com"
+            await create_user_db(clerk_id, email, session)
+            await invalidate_cached_user(cache, clerk_id)
+            user = await get_user_db(auth_payload, session)
+
+    await set_cached_user(cache, user)
+    logger.info("User dependency resolved: %s", user.id)
+    return user
+
 
 UserDependency = Annotated[GetUser, Depends(get_user_dp)]
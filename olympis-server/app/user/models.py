@@ -2,7 +2,7 @@ import enum
 import uuid
 from typing import List
 
-from sqlalchemy import String, ForeignKey, Enum as SAEnum
+from sqlalchemy import Index, String, ForeignKey, Enum as SAEnum
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -54,6 +54,14 @@ class StoreRole(str, enum.Enum):
 
 class AssociationUserStore(Base, TimestampMixin):
     __tablename__ = "association_user_store"
+    __table_args__ = (
+        Index(
+            "ix_association_user_store_user_id_created_at_store_id",
+            "user_id",
+            "created_at",
+            "store_id",
+        ),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -62,7 +70,7 @@ class AssociationUserStore(Base, TimestampMixin):
     )
     store_id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
-        ForeignKey("stores.id"),
+        ForeignKey("stores.id", ondelete="CASCADE"),
         primary_key=True,
     )
     role: Mapped[StoreRole] = mapped_column(SAEnum(StoreRole, name="store_role"))
@@ -10,9 +10,9 @@ router = APIRouter()
 
 @router.get("/profile", response_model=GetUser)
 async def read_profile(user: UserDependency):
-    logger.info(f"Profile requested for user: {user.id}")
+    logger.info("Profile requested for user: %s", user.id)
     try:
         return user
     except Exception as e:
-        logger.exception(f"Error retrieving profile for user: {user.id}")
+        logger.exception("Error retrieving profile for user: %s", user.id)
         raise
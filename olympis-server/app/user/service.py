@@ -16,7 +16,7 @@ logger = get_logger(__name__)
 
 async def get_user_db(auth_payload: Dict[str, Any], session: AsyncSession) -> GetUser:
     external_id = auth_payload["sub"]
-    logger.info(f"Fetching user from database with external_id: {external_id}")
+    logger.info("Fetching user from database with external_id: %s", external_id)
 
     try:
         row = await session.execute(
@@ -25,20 +25,20 @@ async def get_user_db(auth_payload: Dict[str, Any], session: AsyncSession) -> Ge
         found = row.one_or_none()
 
         if not found:
-            logger.warning(f"User not found with external_id: {external_id}")
+            logger.warning("User not found with external_id: %s", external_id)
             raise ResourceNotFoundError("User not found")
 
         uid, ext = found
-        logger.info(f"User found with id: {uid}")
+        logger.info("User found with id: %s", uid)
         return GetUser(id=uid, external_id=ext)
 
     except SQLAlchemyError:
-        logger.exception(f"Error fetching user with external_id: {external_id}")
+        logger.exception("Error fetching user with external_id: %s", external_id)
         raise
 
 
 async def create_user_db(external_id: str, email: str, session: AsyncSession) -> User:
-    logger.info(f"Creating new user with external_id: {external_id}, email: {email}")
+    logger.info("Creating new user with external_id: %s, email: %s", external_id, email)
 
     try:
         user = User(
@@ -50,17 +50,17 @@ async def create_user_db(external_id: str, email: str, session: AsyncSession) ->
         async with session.begin():
             session.add(user)
 
-        logger.info(f"User created successfully with id: {user.id}")
+        logger.info("User created successfully with id: %s", user.id)
         return user
     except IntegrityError as e:
         logger.exception(
-            f"Integrity error creating user with external_id: {external_id}"
+            "Integrity error creating user with external_id: %s", external_id
         )
         raise ValidationException(
             "User with external id " + external_id + " could not be created."
         ) from e
     except Exception:
         logger.exception(
-            f"Unexpected error creating user with external_id: {external_id}"
+            "Unexpected error creating user with external_id: %s", external_id
         )
         raise